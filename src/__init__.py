@@ -0,0 +1,33 @@
+"""
+Blackjack game engine and Gymnasium environments.
+
+The game core (cards, deck, hands, seats, table and chips) only depends on NumPy and is imported eagerly.
+The Gymnasium environments are loaded on first access, and pygame only when an environment renders a frame.
+"""
+
+from src.card import Card
+from src.chip import Chip
+from src.deck import Deck
+from src.hand import Hand, Outcome
+from src.seat import Seat
+from src.table import Table
+
+_LAZY = {
+    "BlackJackEnv": "src.environment",
+    "BlackJackVectorEnv": "src.vector_environment",
+    "FlatObservation": "src.observation",
+    "Renderer": "src.renderer",
+}
+
+__all__ = ["Card", "Chip", "Deck", "Hand", "Outcome", "Seat", "Table", *_LAZY]
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module 'src' has no attribute '{name}'")
+    import importlib
+
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,34 @@
+from stable_baselines3.common.callbacks import BaseCallback
+
+
+COUNTERS = ("played_hands", "win", "loss", "draw", "illegal_moves", "money", "all_money")
+
+
+class EpisodeStatsCallback(BaseCallback):
+    """
+    Logs the game counters of every ``BlackJackEnv`` worker, summed over all workers.
+
+    Every ``log_freq`` calls the counters are read with ``get_attr`` from the (possibly multiprocess)
+    training environment, and the rates since the previous read are recorded under ``blackjack/``.
+    """
+
+    def __init__(self, log_freq=1000, verbose=0):
+        super(EpisodeStatsCallback, self).__init__(verbose)
+        self.log_freq = log_freq
+        self.last = dict.fromkeys(COUNTERS, 0)
+
+    def _on_step(self):
+        if self.n_calls % self.log_freq == 0:
+            totals = {name: sum(self.training_env.get_attr(name)) for name in COUNTERS}
+            delta = {name: totals[name] - self.last[name] for name in COUNTERS}
+            self.last = totals
+            hands = max(delta["played_hands"], 1)
+            self.logger.record("blackjack/win_rate", delta["win"] / hands)
+            self.logger.record("blackjack/loss_rate", delta["loss"] / hands)
+            self.logger.record("blackjack/draw_rate", delta["draw"] / hands)
+            self.logger.record("blackjack/illegal_moves", delta["illegal_moves"])
+            self.logger.record("blackjack/money", delta["money"])
+            if delta["all_money"]:
+                self.logger.record("blackjack/money_per_bet", delta["money"] / delta["all_money"])
+            self.logger.record("blackjack/played_hands", totals["played_hands"])
+        return True
@@ -1,36 +1,98 @@
-
 suits = ('Hearts', 'Diamonds', 'Spades', 'Clubs')
 ranks = ('Two', 'Three', 'Four', 'Five', 'Six', 'Seven', 'Eight', 'Nine', 'Ten', 'Jack', 'Queen', 'King', 'Ace')
 values = {'Two': 2, 'Three': 3, 'Four': 4, 'Five': 5, 'Six': 6, 'Seven': 7, 'Eight': 8, 'Nine': 9, 'Ten': 10,
           'Jack': 10, 'Queen': 10, 'King': 10, 'Ace': 11}
 
+# Integer card encoding: code = rank_index * NUM_SUITS + suit_index, so a full deck is range(52).
+NUM_SUITS = len(suits)
+NUM_RANKS = len(ranks)
+NUM_CODES = NUM_SUITS * NUM_RANKS
+ACE = ranks.index('Ace')
+
+RANK_VALUES = tuple(values[rank] for rank in ranks)
+CODE_RANKS = tuple(code // NUM_SUITS for code in range(NUM_CODES))
+CODE_SUITS = tuple(code % NUM_SUITS for code in range(NUM_CODES))
+CODE_VALUES = tuple(RANK_VALUES[rank_index] for rank_index in CODE_RANKS)
+CODE_IS_ACE = tuple(rank_index == ACE for rank_index in CODE_RANKS)
+
+# Hi-Lo counting tags, indexed by card value - 2 (2-6: +1, 7-9: 0, 10 and Ace: -1).
+HI_LO = (1, 1, 1, 1, 1, 0, 0, 0, -1, -1)
+
+_SUIT_INDEX = {suit: index for index, suit in enumerate(suits)}
+_RANK_INDEX = {rank: index for index, rank in enumerate(ranks)}
+
+
+def encode(rank_index, suit_index):
+    """
+    Packs a rank index and a suit index into a single integer card code.
+    """
+    return rank_index * NUM_SUITS + suit_index
+
 
 class Card:
     """
     Class representing a playing card.
 
+    The card itself is stored as an integer code (see ``encode``); the string attributes are
+    derived from it and only needed for rendering and printing.
+
     Attributes:
+    - code (int): The integer code of the card (rank_index * 4 + suit_index).
     - suit (str): The suit of the card ('Hearts', 'Diamonds', 'Spades', 'Clubs').
     - rank (str): The rank of the card ('Two', 'Three', ..., 'King', 'Ace').
     - value (int): The value of the card in the game of Blackjack.
     - hidden (bool): Whether the card is hidden (e.g., the dealer's hole card).
     """
 
+    __slots__ = ('code', 'hidden')
+
     def __init__(self, suit, rank, hidden=False):
         """
         Initializes a playing card with a given suit and rank.
         """
-        self.suit = suit
-        self.rank = rank
-        self.value = values[rank]
+        self.code = encode(_RANK_INDEX[rank], _SUIT_INDEX[suit])
         self.hidden = hidden
 
+    @classmethod
+    def from_code(cls, code, hidden=False):
+        """
+        Creates a card directly from its integer code.
+        """
+        card = cls.__new__(cls)
+        card.code = int(code)
+        card.hidden = hidden
+        return card
+
+    @property
+    def rank_index(self):
+        return CODE_RANKS[self.code]
+
+    @property
+    def suit_index(self):
+        return CODE_SUITS[self.code]
+
+    @property
+    def rank(self):
+        return ranks[CODE_RANKS[self.code]]
+
+    @property
+    def suit(self):
+        return suits[CODE_SUITS[self.code]]
+
+    @property
+    def value(self):
+        return CODE_VALUES[self.code]
+
+    @property
+    def is_ace(self):
+        return CODE_IS_ACE[self.code]
+
     def get_asset_path(self):
         """
         Returns the file path of the asset for this card.
         """
         # Card file names are formatted as 'rank_of_suit.png'
-        card_name = f"{self.rank}_of_{self.suit.lower()}.png"
+        card_name = f"{self.rank.lower()}_of_{self.suit.lower()}.png"
 
         # The assets are stored in the 'assets' directory
         asset_path = f"../assets/{card_name}"
@@ -51,16 +113,16 @@ class Card:
         """
         Checks if two cards are equal.
         """
-        return self.suit == other.suit and self.rank == other.rank
+        return self.code == other.code
 
     def __lt__(self, other):
         """
         Checks if this card is less than another card based on their values.
         """
-        return values[self.rank] < values[other.rank]
+        return CODE_VALUES[self.code] < CODE_VALUES[other.code]
 
     def __gt__(self, other):
         """
         Checks if this card is greater than another card based on their values.
         """
-        return values[self.rank] > values[other.rank]
+        return CODE_VALUES[self.code] > CODE_VALUES[other.code]
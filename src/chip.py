@@ -21,6 +21,15 @@ class Chip:
         """
         return self.value
 
+    def reset(self, value):
+        """
+        Sets the value of the chip back to the given amount.
+
+        Args:
+        - value (int): The new value of the chip.
+        """
+        self.value = value
+
     def double(self):
         """
         Doubles the value of the chip.
@@ -1,65 +1,174 @@
-from src.card import Card, suits, ranks, values
-import random
+import numpy as np
+
+from src.card import Card, NUM_CODES, CODE_VALUES, HI_LO
+from src.seeding import make_rng
 
 
 class Deck:
     """
-    Class representing a deck of playing cards.
+    Class representing a shoe of playing cards.
+
+    The shoe is a preallocated integer array of card codes. Dealing advances a cursor into the array
+    and reshuffling permutes the same buffer in place, so no card objects are rebuilt between shoes.
 
     Attributes:
-    - cards (list): A list of Card objects representing the deck of cards.
+    - shoe (np.ndarray): The card codes of the shoe, dealt from index ``cursor`` onwards.
+    - cursor (int): The index of the next card to be dealt.
     - num_decks (int) : Number of Deck, Each deck has 52 card
-    - cards_drawn_from_each (list): A list of integers representing the number of cards drawn from each rank.
+    - rng (np.random.Generator): The random generator used for shuffling.
+    - shoe_source: Optional source of pre-shuffled shoes (e.g. a ``ShoeBank``) used instead of ``rng`` to shuffle.
+    - views (list): One reusable Card object per shoe position, handed out by ``hit``.
+    - full_counts (np.ndarray): The number of cards of each rank in a full shoe.
+    - remaining_counts (np.ndarray): The number of unseen cards of each rank (2, 3, ..., 9, 10, A).
+    - remaining_total (int): The number of unseen cards. The dealer's hole card stays unseen until it is
+      revealed, so this can be one more than ``len(deck)``.
+    - running_count (int): The Hi-Lo running count of the seen cards.
+    - last_secret (Card): The dealer's hole card, until it is counted by ``add_last_secret_to_prob``.
     """
 
-    def __init__(self, num_decks=8):
+    def __init__(self, num_decks=8, rng=None, shoe_source=None):
         """
         Initializes a deck of playing cards with the specified number of decks.
+
+        Args:
+        - num_decks (int): The number of decks in the shoe.
+        - rng: The random generator, or a seed it is built from (see ``src.seeding.make_rng``).
+        - shoe_source: Optional source of pre-shuffled shoes, e.g. a ``ShoeBank``.
         """
-        self.cards = []
         self.num_decks = num_decks
+        self.rng = rng if isinstance(rng, np.random.Generator) else make_rng(rng)
+        self.shoe_source = shoe_source
+        self.shoe = np.empty(0, dtype=np.uint8)
+        self.cursor = 0
+        self.last_secret = None
+        self.full_counts = np.zeros(10, dtype=np.int64)
+        self.remaining_counts = np.zeros(10, dtype=np.int64)  # 2, 3, 4, 5, 6, 7, 8, 9, 10, A
+        self._drawn = np.zeros(10, dtype=np.int64)
+        self._probabilities = np.zeros(10, dtype=np.float64)
         self.populate_deck()
-        self.cards_drawn_from_each = [0 for _ in range(10)]  # 2, 3, 4, 5, 6, 7, 8, 9, 10, A
         self.last_card = None
         self.last_second_card = None
         self.last_third_card = None
+        assert len(self) == 52 * num_decks, f"Deck must contain {52 * num_decks} cards upon initialization"
+
+    @property
+    def cards(self):
+        """
+        Returns the remaining cards as Card objects (for printing and debugging only).
+        """
+        return [Card.from_code(code) for code in self.shoe[self.cursor:]]
+
+    @property
+    def cards_drawn_from_each(self):
+        """
+        Returns the number of seen cards drawn from each rank, in an internal buffer overwritten by later reads.
+        """
+        return np.subtract(self.full_counts, self.remaining_counts, out=self._drawn)
+
+    @property
+    def true_count(self):
+        """
+        Returns the Hi-Lo true count: the running count per deck of unseen cards.
+        """
+        return self.running_count * 52 / self.remaining_total
+
+    def _restore_counts(self):
+        self.remaining_counts[:] = self.full_counts
+        self.remaining_total = 52 * self.num_decks
+        self.running_count = 0
         self.last_secret = None
-        assert len(self.cards) == 52 * num_decks, f"Deck must contain {52 * num_decks} cards upon initialization"
+        self._probabilities_stale = True
+
+    def _count(self, code):
+        """
+        Removes a seen card from the remaining counts.
+        """
+        index = CODE_VALUES[code] - 2
+        self.remaining_counts[index] -= 1
+        self.remaining_total -= 1
+        self.running_count += HI_LO[index]
+        self._probabilities_stale = True
 
     def populate_deck(self):
         """
-        Populates the deck with playing cards from multiple decks.
+        Puts every card of every deck back into the shoe, in order.
+        """
+        size = NUM_CODES * self.num_decks
+        if self.shoe.shape[0] != size:
+            self.shoe = np.tile(np.arange(NUM_CODES, dtype=np.uint8), self.num_decks)
+            # One reusable Card view per shoe position, rebound to the card dealt from that position.
+            self.views = [Card.from_code(0) for _ in range(size)]
+            self.full_counts[:] = [4] * 8 + [16, 4]
+            self.full_counts *= self.num_decks
+        else:
+            # The buffer always holds a permutation of the full shoe, so sorting restores it in place.
+            self.shoe.sort()
+        self.cursor = 0
+        self._restore_counts()
+
+    def seed(self, seed=None):
         """
-        self.cards.clear()
-        for _ in range(self.num_decks):
-            for suit in suits:
-                for rank in ranks:
-                    self.cards.append(Card(suit, rank))
+        Replaces the random generator and puts the shoe back in order, so that the next shuffles only depend on the seed.
+
+        Args:
+        - seed: An int, a SeedSequence or a Generator (see ``src.seeding.make_rng``).
+        """
+        self.rng = seed if isinstance(seed, np.random.Generator) else make_rng(seed)
+        self.populate_deck()
 
     def shuffle(self):
         """
-        Shuffles the deck of cards.
+        Collects every card back into the shoe and shuffles it in place, or copies in the next shoe of the shoe source.
         """
-        random.shuffle(self.cards)
+        if self.shoe_source is not None:
+            self.shoe_source.next_shoe(self.shoe)
+        else:
+            self.rng.shuffle(self.shoe)
+        self.cursor = 0
+        self._restore_counts()
 
     def hit(self,secret=False):
         """
-        Draws a card from the deck (removes and returns the last card in the list).
+        Draws a card from the deck (returns the card under the cursor and advances it).
+
+        A secret card (the dealer's hole card) is not counted until ``add_last_secret_to_prob`` is called.
         """
-        if len(self.cards) == 0:
+        if self.cursor >= self.shoe.shape[0]:
             raise ValueError("Deck is empty, cannot draw a card")
-        card = self.cards.pop()
+        code = int(self.shoe[self.cursor])
+        card = self.views[self.cursor]
+        card.code = code
+        card.hidden = False
+        self.cursor += 1
         if not secret:
-            self.cards_drawn_from_each[card.value - 2] += 1
+            self._count(code)
             self.last_third_card = self.last_second_card
             self.last_second_card = self.last_card
             self.last_card = card
         else:
+            # A hole card that was never revealed (the round ended early) is counted before the next one.
+            self.add_last_secret_to_prob()
+            self.last_secret = card
             self.last_third_card = self.last_second_card
             self.last_second_card = self.last_card
-            self.last_card = random.choice(self.cards)
+            # The hole card is the last card of the shoe when nothing is left to stand in for it.
+            size = self.shoe.shape[0]
+            position = self.rng.integers(self.cursor, size) if self.cursor < size else self.cursor - 1
+            self.last_card = self.views[position]
+            self.last_card.code = int(self.shoe[position])
         return card
 
+    def burn(self, count):
+        """
+        Discards cards from the top of the shoe without showing them.
+
+        Args:
+        - count (int): The number of cards to discard.
+        """
+        if self.cursor + count > self.shoe.shape[0]:
+            raise ValueError("Deck is empty, cannot burn cards")
+        self.cursor += count
+
     def needs_shuffle(self):
         """
         Checks if the deck needs to be shuffled.
@@ -67,35 +176,50 @@ class Deck:
         Returns:
         - True if less than 30% of the cards remain in the deck, False otherwise.
         """
-        return len(self.cards) / (52 * self.num_decks) < 0.3
+        return len(self) / (52 * self.num_decks) < 0.3
 
     def reset(self, num_decks=8):
         """
-        Resets the deck by repopulating and shuffling the cards.
+        Resets the deck by collecting and shuffling the cards.
         """
-        self.cards = []
-        self.num_decks = num_decks
-        self.populate_deck()
-        self.cards_drawn_from_each = [0 for _ in range(10)]  # 2, 3, 4, 5, 6, 7, 8, 9, 10, A
+        if num_decks != self.num_decks:
+            self.num_decks = num_decks
+            self.populate_deck()
+        self.shuffle()
 
-        assert len(self.cards) == 52 * num_decks, f"Deck must contain {52 * num_decks} cards upon initialization"
+        assert len(self) == 52 * num_decks, f"Deck must contain {52 * num_decks} cards upon initialization"
 
-    def probability_of_cards(self):
+    def probability_of_cards(self, out=None):
         """
-        Returns the probability of drawing each card from the deck.
+        Returns the probability of drawing each card from the deck, given the cards seen so far.
+
+        Args:
+        - out (np.ndarray): Optional float array of 10 elements the probabilities are written into.
+
+        Returns:
+        - np.ndarray: The probabilities of 2, 3, ..., 9, 10, A. Without ``out`` this is an internal buffer,
+          recomputed only after a card is seen and overwritten by later calls.
         """
-        remaining_cards = (self.num_decks * 52) - sum(self.cards_drawn_from_each)
-        probabilities = [(((self.num_decks * (16 if index == 8 else 4))-count)/remaining_cards) for index,count in enumerate(self.cards_drawn_from_each)]
-        return probabilities
+        if out is not None:
+            return np.divide(self.remaining_counts, self.remaining_total, out=out)
+        if self._probabilities_stale:
+            np.divide(self.remaining_counts, self.remaining_total, out=self._probabilities)
+            self._probabilities_stale = False
+        return self._probabilities
 
     def add_last_secret_to_prob(self):
         """
-        Adds the last secret card to the probability of drawing each card from the deck.
+        Counts the last secret card once it has been revealed.
         """
-        if self.last_secret:
-            self.cards_drawn_from_each[self.last_secret.value-2] -= 1
+        if self.last_secret is not None:
+            self._count(self.last_secret.code)
             self.last_secret = None
 
+    def __len__(self):
+        """
+        Returns the number of cards remaining in the shoe.
+        """
+        return self.shoe.shape[0] - self.cursor
 
     def __str__(self):
         """
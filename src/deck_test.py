@@ -0,0 +1,46 @@
+import numpy as np
+
+from src.card import CODE_VALUES, HI_LO
+from src.deck import Deck
+
+"""
+Deals whole shoes with ``Deck`` and checks its running counts against a recount of the cards seen so far.
+
+    python -m src.deck_test
+"""
+
+VALUES = np.array(CODE_VALUES)
+TAGS = np.array(HI_LO)
+
+deck = Deck(rng=0)
+rng = np.random.default_rng(0)
+for shoe in range(20):
+    deck.shuffle()
+    assert (deck.remaining_counts == deck.full_counts).all() and deck.running_count == 0
+    hole = None
+    while len(deck):
+        # About one card in five is a hole card, which stays unseen until it is revealed.
+        secret = rng.random() < 0.2
+        deck.hit(secret=secret)
+        if secret:
+            hole = deck.cursor - 1
+        elif rng.random() < 0.5:
+            deck.add_last_secret_to_prob()
+            hole = None
+
+        seen = VALUES[deck.shoe[:deck.cursor]] - 2
+        if deck.last_secret is not None:
+            # A new hole card counts the previous one, so at most the last hole card is unseen.
+            seen = np.delete(seen, hole)
+        drawn = np.bincount(seen, minlength=10)
+        assert (deck.cards_drawn_from_each == drawn).all(), (shoe, deck.cursor)
+        assert (deck.remaining_counts == deck.full_counts - drawn).all(), (shoe, deck.cursor)
+        assert deck.remaining_total == deck.shoe.shape[0] - len(seen), (shoe, deck.cursor)
+        assert deck.running_count == TAGS[seen].sum(), (shoe, deck.cursor)
+        if deck.remaining_total:
+            assert np.isclose(deck.probability_of_cards().sum(), 1.0), (shoe, deck.cursor)
+print("Deck counts match a recount of 20 shoes")
+
+deck.reset(num_decks=2)
+assert (deck.full_counts == [8] * 8 + [32, 8]).all() and len(deck) == 104
+print("Deck counts follow the number of decks")
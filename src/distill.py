@@ -0,0 +1,287 @@
+import numpy as np
+
+from src.environment import make_spaces, PROB_KEYS
+from src.tabular import STATE_SHAPE, NUM_STATES, TabularPolicy, state_index
+from src.vector_environment import BlackJackVectorEnv
+
+"""
+Policy distillation
+
+Turns a trained PPO or DQN model (anything with SB3's ``predict``) into a NumPy lookup table, so that
+evaluation and serving run without torch. The network is only queried in large batches while distilling:
+
+- envV=1 observations take 3072 values, which are all enumerated into a ``TabularPolicy``.
+- envV=2 and envV=3 observations also hold the card probabilities and the last cards. The probabilities
+  are quantized into steps of ``prob_step`` percentage points and the states the model actually visits are
+  sampled on a ``BlackJackVectorEnv`` into a ``LookupPolicy``. States that were never sampled fall back to
+  the model's action for a full shoe.
+
+Both tables provide SB3's ``predict`` as a drop-in replacement of the model, and ``disagreement_rate``
+measures how often they pick another action than the network.
+
+    python -m src.distill models/PPO_5_000_000_env2.zip --envV 2 --output env2_table.npz
+"""
+
+# The dtype of the quantized observations, wide enough for fine probability bins.
+KEY_DTYPE = np.uint16
+KEY_MAX = np.iinfo(KEY_DTYPE).max
+
+
+def quantize(batch_obs, envV, prob_step=1.0):
+    """
+    Quantizes Dict observations into rows of small integers, one column per observed value.
+
+    The probabilities (the percentage fields of envV=2 and the ``prob`` box of envV=3) are floored to
+    multiples of ``prob_step`` percentage points, the other fields are kept as they are. Up to 100 / ``prob_step``
+    bins per probability must fit in a uint16 key, so ``prob_step`` cannot be smaller than 0.002.
+
+    Args:
+    - batch_obs (dict): Dict observations with scalar or array fields.
+    - envV (int): The environment version of the observations.
+    - prob_step (float): The width of a probability bin, in percentage points.
+
+    Returns:
+    - np.ndarray: The uint16 rows, shape (batch size, number of values).
+    """
+    if not 100 / prob_step <= KEY_MAX:
+        raise ValueError(f"prob_step={prob_step} makes more probability bins than a uint16 key holds")
+    columns = []
+    for key in make_spaces(envV)[1].spaces:
+        values = np.asarray(batch_obs[key], dtype=np.float64)
+        if key == "prob":
+            values = values * 100
+        if key == "prob" or key in PROB_KEYS:
+            values = np.floor(values / prob_step)
+        values = values.reshape(values.shape[0] if values.ndim > (key == "prob") else 1, -1)
+        columns.append(values)
+    return np.concatenate(columns, axis=1).astype(KEY_DTYPE)
+
+
+def dequantize(rows, envV, prob_step=1.0):
+    """
+    Returns Dict observations at the middle of the bins of quantized rows (see ``quantize``).
+    """
+    batch_obs = {}
+    column = 0
+    for key, space in make_spaces(envV)[1].spaces.items():
+        size = int(np.prod(space.shape)) if space.shape else 1
+        values = rows[:, column:column + size].astype(np.float64)
+        column += size
+        if key == "prob":
+            batch_obs[key] = ((values + 0.5) * prob_step / 100).astype(space.dtype)
+        elif key in PROB_KEYS:
+            batch_obs[key] = (values[:, 0] * prob_step + prob_step // 2).astype(np.int64)
+        else:
+            batch_obs[key] = values[:, 0].astype(np.int64)
+    return batch_obs
+
+
+def full_shoe_obs(envV, states=None):
+    """
+    Returns the observations of envV=1 states with a full shoe and tens as the last cards.
+
+    Args:
+    - envV (int): The environment version of the observations.
+    - states (np.ndarray): Optional envV=1 state indices, all of them by default.
+
+    Returns:
+    - dict: Dict observations with array fields.
+    """
+    states = np.arange(NUM_STATES) if states is None else states
+    fields = np.unravel_index(states, STATE_SHAPE)
+    batch_obs = dict(zip(("player_sum", "dealer_card", "usable_ace", "can_split", "can_double"), fields))
+    probabilities = np.array([4] * 8 + [16, 4], dtype=np.float64) / 52
+    if envV == 2:
+        for key, probability in zip(PROB_KEYS, probabilities):
+            batch_obs[key] = np.full(len(states), int(probability * 100), dtype=np.int64)
+        batch_obs["last_card"] = np.full(len(states), 10, dtype=np.int64)
+    elif envV == 3:
+        batch_obs["prob"] = np.tile(probabilities.astype(np.float16), (len(states), 1))
+        for key in ("last_card", "last_second_card", "last_third_card"):
+            batch_obs[key] = np.full(len(states), 10, dtype=np.int64)
+    return batch_obs
+
+
+def _predict(model, batch_obs, batch_size):
+    """
+    Returns the deterministic actions of a model for a batch of Dict observations, in chunks of ``batch_size``.
+    """
+    size = len(next(iter(batch_obs.values())))
+    actions = np.empty(size, dtype=np.int8)
+    for start in range(0, size, batch_size):
+        chunk = {key: values[start:start + batch_size] for key, values in batch_obs.items()}
+        actions[start:start + batch_size] = np.asarray(model.predict(chunk, deterministic=True)[0]).reshape(-1)
+    return actions
+
+
+class LookupPolicy:
+    """
+    Deterministic policy stored as one action per quantized envV=2 or envV=3 observation.
+
+    Attributes:
+    - envV (int): The environment version of the observations.
+    - prob_step (float): The width of the probability bins, in percentage points.
+    - keys (np.ndarray): The quantized observations of the table, shape (size, number of values).
+    - actions (np.ndarray): The int8 action of every key.
+    - fallback (TabularPolicy): The actions of observations missing from the table.
+    - disagreement (float): The share of the sampled states on which the table disagrees with the network.
+    """
+
+    def __init__(self, envV, keys, actions, fallback, prob_step=1.0, disagreement=float("nan")):
+        """
+        Initializes the policy from its table.
+
+        Args:
+        - envV (int): The environment version of the observations (2 or 3).
+        - keys (np.ndarray): The quantized observations, see ``quantize``.
+        - actions (np.ndarray): The action of every key.
+        - fallback (TabularPolicy): The actions of observations missing from the table.
+        - prob_step (float): The width of the probability bins used by ``quantize``.
+        - disagreement (float): The disagreement measured while distilling.
+        """
+        self.envV = envV
+        self.prob_step = prob_step
+        self.keys = np.ascontiguousarray(keys, dtype=KEY_DTYPE)
+        self.actions = np.asarray(actions, dtype=np.int8)
+        self.fallback = fallback
+        self.disagreement = disagreement
+        # Every key is hashed as the raw bytes of its row, so a lookup is one dict access.
+        self._index = {key: index for index, key in enumerate(self._row_bytes(self.keys))}
+
+    @staticmethod
+    def _row_bytes(rows):
+        rows = np.ascontiguousarray(rows)
+        return rows.view(np.dtype((np.void, rows.shape[1] * rows.itemsize))).ravel().tolist()
+
+    def get_actions(self, batch_obs):
+        """
+        Returns the actions of the policy for a batch of Dict observations, e.g. from ``BlackJackVectorEnv``.
+
+        Args:
+        - batch_obs (dict): Dict observations with array fields.
+
+        Returns:
+        - np.ndarray: The actions.
+        """
+        index = self._index
+        rows = np.fromiter((index.get(key, -1) for key in self._row_bytes(quantize(batch_obs, self.envV, self.prob_step))),
+                           dtype=np.int64)
+        actions = self.actions[rows]
+        missing = rows < 0
+        if missing.any():
+            states = state_index(batch_obs).reshape(-1)[missing]
+            actions[missing] = self.fallback.table.ravel()[states]
+        return actions
+
+    def predict(self, observation, state=None, episode_start=None, deterministic=True):
+        """
+        Returns the actions of a single or batched Dict observation, with the signature of SB3's ``predict``.
+
+        Returns:
+        - tuple: The action (or array of actions) and ``state``.
+        """
+        actions = self.get_actions(observation)
+        return (actions if np.ndim(observation["player_sum"]) else actions[0]), state
+
+    def save_table(self, path):
+        """
+        Writes the table to a ``.npz`` file.
+        """
+        np.savez(path, envV=self.envV, prob_step=self.prob_step, keys=self.keys, actions=self.actions,
+                 fallback=self.fallback.table, disagreement=self.disagreement)
+
+    @classmethod
+    def load_table(cls, path):
+        """
+        Reads a policy written by ``save_table``.
+        """
+        with np.load(path) as data:
+            return cls(int(data["envV"]), data["keys"], data["actions"], TabularPolicy(data["fallback"]),
+                       float(data["prob_step"]), float(data["disagreement"]))
+
+    def __len__(self):
+        """
+        Returns the number of quantized observations in the table.
+        """
+        return len(self.actions)
+
+
+def distill(model, envV=1, prob_step=1.0, steps=1000, num_envs=1024, batch_size=65536, seed=None):
+    """
+    Distills a model into a lookup table.
+
+    Args:
+    - model: A model with SB3's ``predict`` trained on Dict observations (e.g. PPO with ``MultiInputPolicy``).
+    - envV (int): The environment version the model was trained on.
+    - prob_step (float): For envV=2 and 3, the width of the probability bins in percentage points.
+    - steps (int): For envV=2 and 3, the number of vector steps sampled, played with the model's actions.
+    - num_envs (int): For envV=2 and 3, the number of tables sampled in lockstep.
+    - batch_size (int): The largest batch of observations passed to ``predict``.
+    - seed: Optional seed of the sampled shoes.
+
+    Returns:
+    - TabularPolicy or LookupPolicy: The table, a ``TabularPolicy`` for envV=1.
+    """
+    if envV == 1:
+        return TabularPolicy(_predict(model, full_shoe_obs(1), batch_size).reshape(STATE_SHAPE))
+
+    fallback = TabularPolicy(_predict(model, full_shoe_obs(envV), batch_size).reshape(STATE_SHAPE))
+    env = BlackJackVectorEnv(num_envs=num_envs, envV=envV, seed=seed, final_observation=False)
+    obs, _ = env.reset()
+    rows = np.empty((steps, num_envs, len(quantize(obs, envV, prob_step)[0])), dtype=KEY_DTYPE)
+    played = np.empty((steps, num_envs), dtype=np.int8)
+    for step in range(steps):
+        rows[step] = quantize(obs, envV, prob_step)
+        played[step] = np.asarray(model.predict(obs, deterministic=True)[0]).reshape(-1)
+        obs, *_ = env.step(played[step])
+
+    keys, inverse = np.unique(rows.reshape(-1, rows.shape[-1]), axis=0, return_inverse=True)
+    actions = _predict(model, dequantize(keys, envV, prob_step), batch_size)
+    disagreement = float(np.mean(actions[inverse.reshape(-1)] != played.reshape(-1)))
+    return LookupPolicy(envV, keys, actions, fallback, prob_step, disagreement)
+
+
+def disagreement_rate(policy, model, envV=1, steps=1000, num_envs=1024, seed=None):
+    """
+    Returns how often a distilled table picks another action than the network, on the states it visits.
+
+    Args:
+    - policy: The table (anything with ``get_actions``), which plays the sampled rounds.
+    - model: The network, with SB3's ``predict``.
+    - envV (int): The environment version of the observations.
+    - steps (int): The number of vector steps played.
+    - num_envs (int): The number of tables played in lockstep.
+    - seed: Optional seed of the shoes.
+
+    Returns:
+    - float: The share of decisions on which the two disagree.
+    """
+    env = BlackJackVectorEnv(num_envs=num_envs, envV=envV, seed=seed, final_observation=False)
+    obs, _ = env.reset()
+    disagreements = 0
+    for _ in range(steps):
+        actions = np.asarray(policy.get_actions(obs)).reshape(-1)
+        disagreements += int(np.count_nonzero(actions != np.asarray(model.predict(obs, deterministic=True)[0]).reshape(-1)))
+        obs, *_ = env.step(actions)
+    return disagreements / (steps * num_envs)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from stable_baselines3 import PPO, DQN
+
+    parser = argparse.ArgumentParser(description="Distills a PPO or DQN model into a lookup table.")
+    parser.add_argument("model")
+    parser.add_argument("--algorithm", choices=["ppo", "dqn"], default="ppo")
+    parser.add_argument("--envV", type=int, default=1)
+    parser.add_argument("--prob-step", type=float, default=1.0)
+    parser.add_argument("--steps", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", required=True, help="The .npy (envV=1) or .npz file the table is written to.")
+    arguments = parser.parse_args()
+
+    network = (PPO if arguments.algorithm == "ppo" else DQN).load(arguments.model, device="cpu")
+    table = distill(network, arguments.envV, arguments.prob_step, arguments.steps, seed=arguments.seed)
+    table.save_table(arguments.output)
+    print(f"Disagreement with the network: {disagreement_rate(table, network, arguments.envV, seed=arguments.seed):.4%}")
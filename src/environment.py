@@ -1,7 +1,6 @@
 from typing import SupportsFloat, Any, Optional
 import gymnasium as gym
 import numpy as np
-import pygame
 from gymnasium.core import ActType, ObsType
 from gymnasium.vector.utils import spaces
 from src.deck import Deck
@@ -9,6 +8,80 @@ from src.table import Table
 from src.seat import Seat
 from src.hand import Hand, Outcome
 from src.chip import Chip
+from src.observation import FlatObservation
+from src.seeding import make_rng, spawn_seeds
+
+# The methods timed by the profiling mode and the phase each one is recorded under.
+PROFILED_PHASES = {
+    "distribute_cards": "deal",
+    "play_action": "action",
+    "dealer_play": "dealer",
+    "results": "results",
+    "sum_all_chips": "chips",
+    "get_obs": "obs",
+}
+
+PROB_KEYS = ("two", "three", "four", "five", "six", "seven", "eight", "nine", "ten", "ace")
+
+
+def make_spaces(envV):
+    """
+    Returns the action and observation spaces of the given environment version.
+
+    Args:
+    - envV (int): The environment version (1, 2 or 3), see the ``states`` file for the layouts.
+
+    Returns:
+    - tuple: The action space and the observation space.
+    """
+    action_space = spaces.Discrete(4)  # 0: stand, 1: hit, 2: double, 3: split
+    if envV == 1:
+        observation_space = spaces.Dict({
+            "player_sum": spaces.Discrete(32),
+            "dealer_card": spaces.Discrete(12),
+            "usable_ace": spaces.Discrete(2),
+            "can_split": spaces.Discrete(2),
+            "can_double": spaces.Discrete(2),
+
+        })
+    elif envV == 2:
+        observation_space = spaces.Dict({
+            "player_sum": spaces.Discrete(32),
+            "dealer_card": spaces.Discrete(12),
+            "usable_ace": spaces.Discrete(2),
+            "can_split": spaces.Discrete(2),
+            "can_double": spaces.Discrete(2),
+
+            "two": spaces.Discrete(100),
+            "three": spaces.Discrete(100),
+            "four": spaces.Discrete(100),
+            "five": spaces.Discrete(100),
+            "six": spaces.Discrete(100),
+            "seven": spaces.Discrete(100),
+            "eight": spaces.Discrete(100),
+            "nine": spaces.Discrete(100),
+            "ten": spaces.Discrete(100),
+            "ace": spaces.Discrete(100),
+            "last_card": spaces.Discrete(12),
+
+        })
+    elif envV == 3:
+        observation_space = spaces.Dict({
+            "player_sum": spaces.Discrete(32),
+            "dealer_card": spaces.Discrete(12),
+            "usable_ace": spaces.Discrete(2),
+            "can_split": spaces.Discrete(2),
+            "can_double": spaces.Discrete(2),
+
+            "prob":spaces.Box(low=0, high=100, shape=(10,), dtype=np.float16),
+            "last_card":spaces.Discrete(12),
+            "last_second_card":spaces.Discrete(12),
+            "last_third_card":spaces.Discrete(12),
+
+        })
+    else:
+        raise ValueError(f"Unknown environment version: {envV}")
+    return action_space, observation_space
 
 
 class BlackJackEnv(gym.Env):
@@ -16,8 +89,7 @@ class BlackJackEnv(gym.Env):
     A Blackjack environment.
 
     Attributes:
-        - screen: The Pygame screen for rendering the game.
-        - clock: The Pygame clock for managing time.
+        - renderer: The Pygame renderer, created on the first "human" or "rgb_array" render.
         - seats_count: The number of seats at the table.
         - chip_amounts: The list of chip amounts for each seat.
          - win: The number of wins.
@@ -29,14 +101,15 @@ class BlackJackEnv(gym.Env):
         - dealer_hand: The dealer's hand.
         - playingHand: The current playing hand.
         - done: Flag indicating if the game is done.
+        - illegal_action_mode: "terminate" or "mask", what an illegal double or split does.
         - reward: The reward for the current action.
         - action_space: The action space for the environment.
         - observation_space: The observation space for the environment.
 
     """
 
-    metadata = {"render_modes": ["human", "cmd"], "render_fps": 1}
-    def __init__(self, seats_count=1, chip_amounts= [100],render_mode="cmd",fps=1,envV = 1,*args, **kwargs):
+    metadata = {"render_modes": ["human", "rgb_array", "cmd"], "render_fps": 1}
+    def __init__(self, seats_count=1, chip_amounts= [100],render_mode="cmd",fps=1,envV = 1,obs_mode="dict",one_hot=True,frame_skip=1,shoe_source=None,profile=False,profile_window=10000,profile_allocations=False,illegal_action_mode="terminate",*args, **kwargs):
         super().__init__()
         """
         Initializes a Blackjack environment.
@@ -44,17 +117,31 @@ class BlackJackEnv(gym.Env):
         Args:
         - seats_count (int): The number of seats at the table.
         - chip_amounts (list): A list of chip amounts for each seat.
+        - obs_mode (str): "dict" for Dict observations, "flat" for a single reusable float32 vector.
+        - one_hot (bool): Whether the discrete fields of flat observations are one-hot encoded.
+        - frame_skip (int): For "human" and "rgb_array" rendering, draw a new frame only every frame_skip renders.
+        - shoe_source: Optional source of pre-shuffled shoes for the deck, e.g. a ``ShoeBank``.
+        - profile (bool): Whether to time the phases of every round, see ``get_profile``.
+        - profile_window (int): The number of recent samples of every phase kept by the profiler.
+        - profile_allocations (bool): Whether the profiler also counts the memory blocks allocated by every phase (slower).
+        - illegal_action_mode (str): "terminate" ends the round with -100 per hand on an illegal double or split,
+          "mask" plays it as a hit instead (use with ``action_masks`` so that the agent never picks it).
 
         """
         self.envV = envV
+        self.obs_mode = obs_mode
+        if illegal_action_mode not in ("terminate", "mask"):
+            raise ValueError(f"Unknown illegal action mode: {illegal_action_mode}")
+        self.illegal_action_mode = illegal_action_mode
 
-        self.screen = None
-        self.clock = None
+        self.renderer = None
 
         self.seats_count = seats_count
         self.chip_amounts = chip_amounts
         self.render_mode = render_mode
         self.fps = fps
+        self.frame_skip = frame_skip
+        self.metadata = dict(self.metadata, render_fps=fps)
 
         self.win = 0
         self.loss = 0
@@ -66,7 +153,16 @@ class BlackJackEnv(gym.Env):
         self.earn_money_rate = 0
         self.loss_money_rate = 0
 
-        self.deck = Deck()
+        self.profiler = None
+        if profile:
+            # Imported here so that environments without profiling do not load it.
+            from src.profiler import PhaseProfiler
+            self.profiler = PhaseProfiler(window=profile_window, count_allocations=profile_allocations)
+            self.profiler.instrument(self, PROFILED_PHASES)
+            self.step = self._profiled(self.step, "step")
+            self.reset = self._profiled(self.reset, "reset")
+
+        self.deck = Deck(shoe_source=shoe_source)
         self.deck.shuffle()
         self.table = Table()
         self.table = self.create_objects(self.table,self.seats_count, self.chip_amounts)
@@ -76,58 +172,13 @@ class BlackJackEnv(gym.Env):
         self.distribute_cards()
         self.reward = 0
 
-        if envV ==1:
-            self.action_space = spaces.Discrete(4)  # 0: stand, 1: hit, 2: double, 3: split
-
-            self.observation_space = spaces.Dict({
-                "player_sum": spaces.Discrete(32),
-                "dealer_card": spaces.Discrete(12),
-                "usable_ace": spaces.Discrete(2),
-                "can_split": spaces.Discrete(2),
-                "can_double": spaces.Discrete(2),
-
-            })
-
-        if envV == 2:
-            self.action_space = spaces.Discrete(4)  # 0: stand, 1: hit, 2: double, 3: split
-
-            self.observation_space = spaces.Dict({
-                "player_sum": spaces.Discrete(32),
-                "dealer_card": spaces.Discrete(12),
-                "usable_ace": spaces.Discrete(2),
-                "can_split": spaces.Discrete(2),
-                "can_double": spaces.Discrete(2),
-
-                "two": spaces.Discrete(100),
-                "three": spaces.Discrete(100),
-                "four": spaces.Discrete(100),
-                "five": spaces.Discrete(100),
-                "six": spaces.Discrete(100),
-                "seven": spaces.Discrete(100),
-                "eight": spaces.Discrete(100),
-                "nine": spaces.Discrete(100),
-                "ten": spaces.Discrete(100),
-                "ace": spaces.Discrete(100),
-                "last_card": spaces.Discrete(12),
-
-            })
-        if envV == 3:
-            self.action_space = spaces.Discrete(4)  # 0: stand, 1: hit, 2: double, 3: split
-
-            self.observation_space = spaces.Dict({
-                "player_sum": spaces.Discrete(32),
-                "dealer_card": spaces.Discrete(12),
-                "usable_ace": spaces.Discrete(2),
-                "can_split": spaces.Discrete(2),
-                "can_double": spaces.Discrete(2),
-
-                "prob":spaces.Box(low=0, high=100, shape=(10,), dtype=np.float16),
-                "last_card":spaces.Discrete(12),
-                "last_second_card":spaces.Discrete(12),
-                "last_third_card":spaces.Discrete(12),
-
-
-            })
+        self.action_space, self.observation_space = make_spaces(envV)
+        self.flat_obs = None
+        if obs_mode == "flat":
+            self.flat_obs = FlatObservation(self.observation_space, one_hot=one_hot)
+            self.observation_space = self.flat_obs.space
+        elif obs_mode != "dict":
+            raise ValueError(f"Unknown observation mode: {obs_mode}")
 
         #self.observation_space = spaces.MultiDiscrete([17, 10, 2])
 
@@ -142,29 +193,15 @@ class BlackJackEnv(gym.Env):
         - action (ActType): The action to take.
 
         Returns:
-        - tuple: Tuple containing the next observation, reward, done flag, info dictionary.
+        - tuple: Tuple containing the next observation, reward, done flag, info dictionary (see ``get_info``).
         """
         hand, seat = self.get_next_hand()
 
-        if action == 0:
-            hand.done = True
-        elif action == 1:
-            hand.add_card(self.deck.hit())
-            hand.is_busted()
-        elif action == 2:
-            if not hand.double_down(self.deck):
-                self.illegal_moves += 1
-                return self.get_obs(), self.table.len_hands() * -100, True, True, {}
-                pass
-
-        elif action == 3:
-            if not seat.split_hand():
-                self.illegal_moves += 1
-                return self.get_obs(), self.table.len_hands() * -100, True, True, {}
-                pass
-            else:
-                seat.hands[0].add_card(self.deck.hit())
-                seat.hands[1].add_card(self.deck.hit())
+        if not self.play_action(action, hand, seat):
+            self.illegal_moves += 1
+            if self.illegal_action_mode == "terminate":
+                return self.get_obs(), self.table.len_hands() * -100, True, True, self.get_info()
+            self.play_action(1, hand, seat)
 
         self.playingHand = hand
         hand = self.get_next_hand()
@@ -177,11 +214,83 @@ class BlackJackEnv(gym.Env):
             self.done = True
             self.sum_all_chips()
             self.deck.add_last_secret_to_prob()
-            return self.get_obs(), self.reward, True, True, {}
+            return self.get_obs(), self.reward, True, True, self.get_info()
         else:
             self.playingHand = hand[0]
 
-        return self.get_obs(), 0, False, False, {}
+        return self.get_obs(), 0, False, False, self.get_info()
+
+    def play_action(self, action, hand, seat):
+        """
+        Applies an action to the hand being played.
+
+        Args:
+        - action (int): 0: stand, 1: hit, 2: double, 3: split.
+        - hand (Hand): The hand being played.
+        - seat (Seat): The seat of the hand.
+
+        Returns:
+        - bool: False if the action is illegal (doubling or splitting a hand that cannot be), True otherwise.
+        """
+        if action == 0:
+            hand.done = True
+        elif action == 1:
+            hand.add_card(self.deck.hit())
+            if hand.is_busted():
+                self.table.unresolved_hands -= 1
+        elif action == 2:
+            if not hand.double_down(self.deck):
+                return False
+            if hand.case == Outcome.LOSS:
+                self.table.unresolved_hands -= 1
+        elif action == 3:
+            if not seat.split_hand():
+                return False
+            self.table.unresolved_hands += 1
+            seat.hands[0].add_card(self.deck.hit())
+            seat.hands[1].add_card(self.deck.hit())
+        return True
+
+    def action_masks(self):
+        """
+        Returns the legal actions of the hand being played (the method masked PPO implementations look for).
+
+        Returns:
+        - np.ndarray: Boolean mask of stand, hit, double and split.
+        """
+        hand = self.playingHand
+        return np.array([True, True, hand.can_double(), hand.can_split()])
+
+    def get_info(self):
+        """
+        Returns the info dict of a step or reset, holding the legal actions under "action_mask".
+        """
+        return {"action_mask": self.action_masks()}
+
+    def _profiled(self, method, phase):
+        """
+        Returns a timed version of ``step`` or ``reset`` that adds the durations (ns) of the phases it ran
+        to its info dict, under "profile".
+        """
+        profiler = self.profiler
+        timed = profiler.wrap(phase, method)
+
+        def profiled(*args, **kwargs):
+            profiler.begin()
+            result = timed(*args, **kwargs)
+            result[-1]["profile"] = profiler.current
+            return result
+
+        return profiled
+
+    def get_profile(self):
+        """
+        Returns the recent timings of every phase (see ``PhaseProfiler.summary``), or an empty dict if the
+        environment was created without ``profile=True``.
+        """
+        if self.profiler is None:
+            return {}
+        return self.profiler.summary()
 
     def reset(
         self,
@@ -192,7 +301,8 @@ class BlackJackEnv(gym.Env):
         Reset the environment.
 
         Args:
-        - seed (int): Optional seed for random number generation.
+        - seed: Optional seed (an int or a SeedSequence). The deck gets its own generator derived from it and
+          is reshuffled, so the rounds that follow only depend on the seed.
         - options (dict): Optional dictionary of environment options.
         - full_reset (bool): Whether to fully reset the environment or not.
 
@@ -200,175 +310,37 @@ class BlackJackEnv(gym.Env):
         - ObsType: The initial observation after reset.
         """
 
-        if full_reset:
-            self.deck = Deck()
-            self.deck.shuffle()
-        else:
-            if self.deck.needs_shuffle():
-                self.deck = Deck()
-                self.deck.shuffle()
+        if seed is not None:
+            deck_seed, space_seed = spawn_seeds(seed, 2)
+            self._np_random = make_rng(seed)
+            self.action_space.seed(int(space_seed.generate_state(1)[0]))
+            self.deck.seed(deck_seed)
+            full_reset = True
 
-        self.table = Table()
+        if full_reset or self.deck.needs_shuffle():
+            self.deck.reset()
 
-        self.table = self.create_objects(self.table,self.seats_count , self.chip_amounts)
+        self.table.reset(self.chip_amounts)
         self.done = False
-        self.dealer_hand = Hand(chip=Chip(0))
+        self.dealer_hand.clear()
         self.playingHand = self.get_next_hand()[0]
         self.distribute_cards()
-        return self.get_obs(),{}
+        return self.get_obs(), self.get_info()
 
     def render(self):
         """
          Render the environment.
 
-         Args:
-         - mode (str): The rendering mode. Options are 'human' or 'cmd'.
+         The rendering mode is set at construction: 'human' draws in a window, 'rgb_array' draws off-screen
+         and returns the frame as a NumPy array, 'cmd' prints the hands.
          """
 
-        if self.render_mode == 'human':
-
-            def draw_circle(window, value, x, y, color= (0, 0, 0)):
-                circle_radius = 12
-                circle_color = color
-                font = pygame.font.SysFont(None, 24)
-                text_color = (255, 255, 255)  # Beyaz renk
-
-                pygame.draw.circle(window, circle_color, (int(x), int(y)), circle_radius)
-
-                text_surface = font.render(str(value), True, text_color)
-                text_rect = text_surface.get_rect()
-                text_rect.center = (int(x), int(y))
-
-                window.blit(text_surface, text_rect)
-
-            if self.screen is None:
-
-                pygame.init()
-                pygame.display.set_caption("BlackJack")
-                self.screen = pygame.display.set_mode((800, 600))
-                self.clock = pygame.time.Clock()
-
-                self.screenWidth , self.screenHeight = pygame.display.get_surface().get_size()
-                self.cardWidth = 50
-                self.cardHeight = 80
-
-            self.screen.fill((0, 128, 0))
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    exit()
-            self.clock.tick(self.fps)
-
-            for indexCard,card in enumerate(self.dealer_hand.cards):
-                if card.hidden:
-                    image = pygame.transform.scale(pygame.image.load("../assets/cardback.png"), (self.cardWidth, self.cardHeight))
-                    self.screen.blit(image, ((self.screenWidth/2)+(indexCard*10)-(self.cardWidth/2),(70)-(indexCard*10)))
-                else:
-                    image = pygame.transform.scale(pygame.image.load(card.get_asset_path()), (self.cardWidth, self.cardHeight))
-                    self.screen.blit(image, ((self.screenWidth/2)+(indexCard*10)-(self.cardWidth/2),(70)-(indexCard*10)))
-                draw_circle(self.screen, self.dealer_hand.get_value(), self.screenWidth/2, 170)
-
-            num_seats = len(self.table.seats)
-            seat_space = self.screenWidth / num_seats
-            order = True
-            for indexSeat,seat in enumerate(self.table.seats):
-                splited_hand = len(seat.hands)==2
-                for indexHand,hand in enumerate(seat.hands):
-                    for indexCard,card in enumerate(hand.cards):
-                        image = pygame.transform.scale(pygame.image.load(card.get_asset_path()), (self.cardWidth, self.cardHeight))
-                        main_space = (self.screenWidth-((indexSeat+1)*seat_space-(seat_space/2)))
-                        if splited_hand:
-                            if indexHand == 0:
-                                main_space = main_space + (seat_space/4)
-                            else:
-                                main_space = main_space - (seat_space/4)
-                        self.screen.blit(image, (main_space+(indexCard*10)-(self.cardWidth/2),(self.screenHeight-150)-(indexCard*10)))
-
-                    if not hand.done and order:
-                        color = (255,165,0)
-                        order = False
-                    elif not hand.done:
-                        color = (0, 255, 0)
-                    else:
-                        color = (255, 0, 0)
-                    draw_circle(self.screen, hand.get_value(), main_space, self.screenHeight-40,color)
-                    if hand.doubled:
-                        draw_circle(self.screen, "2x", main_space, self.screenHeight-15)
-
-
-            rect_width = 100
-            rect_height = 220
-            rect_x = self.screenWidth - rect_width - 10
-            rect_y = 10
-
-            font = pygame.font.SysFont("Arial", 12)
-            surface = pygame.Surface((rect_width, rect_height), pygame.SRCALPHA)
-            surface.fill((0, 0, 0, 128))  # Şeffaf dikdörtgen
-            for i, probability in enumerate(self.deck.probability_of_cards()):
-                text = f"{i + 2}: {100 * probability:.2f} %"
-                text_surface = font.render(text, True, (255, 255, 255))
-                surface.blit(text_surface, (10, 10 + i * 20))
-            self.screen.blit(surface, (rect_x, rect_y))
-
-            rect_width = 130
-            rect_height = 220
-            rect_x = 10
-            rect_y = 10
-
-            font = pygame.font.SysFont("Arial", 12)
-            surface = pygame.Surface((rect_width, rect_height), pygame.SRCALPHA)
-            surface.fill((0, 0, 0, 128))  # Şeffaf dikdörtgen
-            text = f"Games: {self.played_hands}"
-            text_surface = font.render(text, True, (255, 255, 255))
-            surface.blit(text_surface, (10, 10))
-
-            text = f"Win: {self.win}"
-            text_surface = font.render(text, True, (255, 255, 255))
-            surface.blit(text_surface, (10, 10 + 20))
-
-            text = f"Lose: {self.loss}"
-            text_surface = font.render(text, True, (255, 255, 255))
-            surface.blit(text_surface, (10, 10 + 40))
-
-            text = f"Draw: {self.draw}"
-            text_surface = font.render(text, True, (255, 255, 255))
-            surface.blit(text_surface, (10, 10 + 60))
-
-            text = "-"*20
-            text_surface = font.render(text, True, (255, 255, 255))
-            surface.blit(text_surface, (10, 10 + 80))
-
-            text = f"Money: {self.money * 100}"
-            text_surface = font.render(text, True, (255, 255, 255))
-            surface.blit(text_surface, (10, 10 + 100))
-
-            text = f"Earn Rate: {100 * self.earn_money_rate:.2f} %"
-            text_surface = font.render(text, True, (255, 255, 255))
-            surface.blit(text_surface, (10, 10 + 120))
-
-            text = f"Loss Rate: {100 * self.loss_money_rate:.2f} %"
-            text_surface = font.render(text, True, (255, 255, 255))
-            surface.blit(text_surface, (10, 10 + 140))
-            self.screen.blit(surface, (rect_x, rect_y))
-
-
-            if self.done:
-                rect_width = self.screenWidth / 2.5
-                rect_height = self.screenHeight / 3
-                rect_x = (self.screenWidth - rect_width) / 2
-                rect_y = (self.screenHeight - rect_height) / 2
-
-                if self.reward > 0:
-                    color = (0, 255, 0)
-                else:
-                    color = (255, 0, 0)
-
-                pygame.draw.rect(self.screen, (169,169,169), (rect_x, rect_y, rect_width, rect_height))
-                font = pygame.font.Font(None, 36)
-                text_surface = font.render("Reward: " + str(self.reward), True, color)
-                text_rect = text_surface.get_rect(center=(self.screenWidth / 2, self.screenHeight / 2))
-                self.screen.blit(text_surface, text_rect)
-
-            pygame.display.flip()
+        if self.render_mode in ('human', 'rgb_array'):
+            if self.renderer is None:
+                # Imported here so that pygame is only loaded by environments that actually draw.
+                from src.renderer import Renderer
+                self.renderer = Renderer(fps=self.fps, mode=self.render_mode, frame_skip=self.frame_skip)
+            return self.renderer.render(self)
 
         elif self.render_mode == 'cmd':
             print("Dealer's Hand: ", self.dealer_hand)
@@ -392,26 +364,30 @@ class BlackJackEnv(gym.Env):
         """
         Close the environment.
         """
-        if self.screen is not None:
-            pygame.quit()
+        if self.renderer is not None:
+            self.renderer.close()
+            self.renderer = None
 
 
     def get_obs(self):
 
+        if self.flat_obs is not None:
+            return self.get_flat_obs()
+
         if self.envV == 1:
             return {
-                "player_sum": self.playingHand.get_value(),
+                "player_sum": self.playingHand.value,
                 "dealer_card": self.dealer_hand.cards[0].value,
-                "usable_ace": self.playingHand.usable_ace_count(),
+                "usable_ace": 1 if self.playingHand.soft else 0,
                 "can_split": 1 if self.playingHand.can_split() else 0,
                 "can_double": 1 if self.playingHand.can_double() else 0,
             }
         elif self.envV ==2:
             prob = self.deck.probability_of_cards()
             return {
-                "player_sum": self.playingHand.get_value(),
+                "player_sum": self.playingHand.value,
                 "dealer_card": self.dealer_hand.cards[0].value,
-                "usable_ace": self.playingHand.usable_ace_count(),
+                "usable_ace": 1 if self.playingHand.soft else 0,
                 "can_split": 1 if self.playingHand.can_split() else 0,
                 "can_double": 1 if self.playingHand.can_double() else 0,
 
@@ -432,9 +408,9 @@ class BlackJackEnv(gym.Env):
 
             prob = self.deck.probability_of_cards()
             return {
-                "player_sum": self.playingHand.get_value(),
+                "player_sum": self.playingHand.value,
                 "dealer_card": self.dealer_hand.cards[0].value,
-                "usable_ace": self.playingHand.usable_ace_count(),
+                "usable_ace": 1 if self.playingHand.soft else 0,
                 "can_split": 1 if self.playingHand.can_split() else 0,
                 "can_double": 1 if self.playingHand.can_double() else 0,
 
@@ -444,6 +420,28 @@ class BlackJackEnv(gym.Env):
                 "last_third_card": self.deck.last_third_card.value,
             }
 
+    def get_flat_obs(self):
+        """
+        Writes the observation into the reusable flat vector and returns it.
+        """
+        flat = self.flat_obs
+        hand = self.playingHand
+        flat.write("player_sum", hand.value)
+        flat.write("dealer_card", self.dealer_hand.cards[0].value)
+        flat.write("usable_ace", 1 if hand.soft else 0)
+        flat.write("can_split", 1 if hand.can_split() else 0)
+        flat.write("can_double", 1 if hand.can_double() else 0)
+        if self.envV == 2:
+            for key, probability in zip(PROB_KEYS, self.deck.probability_of_cards()):
+                flat.write(key, probability * 100)
+            flat.write("last_card", self.deck.last_card.value)
+        elif self.envV == 3:
+            flat.write("prob", self.deck.probability_of_cards())
+            flat.write("last_card", self.deck.last_card.value)
+            flat.write("last_second_card", self.deck.last_second_card.value)
+            flat.write("last_third_card", self.deck.last_third_card.value)
+        return flat.buffer
+
     def distribute_cards(self):
         for k in range(2):
             for i in self.table.seats:
@@ -469,9 +467,9 @@ class BlackJackEnv(gym.Env):
 
     def dealer_play(self):
 
-        self.dealer_hand.cards[1].hidden = False
+        self.dealer_hand.reveal()
         if self.at_least_one_hand_not_finalized():
-            while self.dealer_hand.get_value() < 17:
+            while self.dealer_hand.value < 17:
                 self.dealer_hand.add_card(self.deck.hit())
 
 
@@ -499,22 +497,14 @@ class BlackJackEnv(gym.Env):
 
 
     def get_next_hand(self):
-        for seat in self.table.seats:
-            for hand in seat.hands:
-                if hand.done == False:
-                    return hand , seat
-        return None
+        return self.table.next_hand()
 
     def at_least_one_hand_not_finalized(self):
         """
         Checks if at least one hand is not finalized.
         :return:
         """
-        for seat in self.table.seats:
-            for hand in seat.hands:
-                if hand.case == Outcome.UNCLEAR:
-                    return True
-        return False
+        return self.table.unresolved_hands > 0
 
     def sum_all_chips(self):
         for seat in self.table.seats:
@@ -530,4 +520,16 @@ class BlackJackEnv(gym.Env):
             self.loss_money_rate = 1 - abs(self.earn_money_rate)
         else:
             self.earn_money_rate = (((self.all_money - self.money) / 2) + self.money) / self.all_money
-            self.loss_money_rate = 1 - abs(self.earn_money_rate)
\ No newline at end of file
+            self.loss_money_rate = 1 - abs(self.earn_money_rate)
+
+ENV_ID = "BlackJackEnv-v0"
+
+# gym.make(ENV_ID, **kwargs) returns a bare BlackJackEnv: the environment checker and the order enforcing wrapper
+# would only add a wrapper layer in front of every attribute read (e.g. the counters read by the training callbacks).
+gym.register(
+    ENV_ID,
+    entry_point="src.environment:BlackJackEnv",
+    vector_entry_point="src.vector_environment:BlackJackVectorEnv",
+    order_enforce=False,
+    disable_env_checker=True,
+)
@@ -0,0 +1,655 @@
+import math
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
+import cloudpickle
+import numpy as np
+
+from src.agent import Agent
+from src.environment import BlackJackEnv
+from src.seeding import spawn_seeds
+from src.vector_environment import BlackJackVectorEnv
+
+"""
+Monte Carlo strategy evaluation
+
+Plays a number of rounds with a policy, sharded over a process pool. Every shard plays on its own
+independently seeded shoe and returns an ``EvaluationStats``; the shards are merged into one result that
+reports the expected reward per round with a confidence interval.
+
+``paired_evaluate`` plays two policies on the same shoes (common random numbers) and reports the difference
+of their EVs with its paired variance, which is far smaller than the variance of two independent runs.
+
+``evaluate_until`` and ``compare_until`` play in batches and stop as soon as the confidence interval of the
+EV is narrow enough, or as soon as two policies can be told apart.
+
+Policies with a batch API (``WikipediaAgent.get_actions`` or an SB3 model's ``predict``) are played on a
+``BlackJackVectorEnv``, every other policy (an ``Agent`` or a function of the environment and the
+observation) on a ``BlackJackEnv``. A batch policy is called once per step with the observations of every
+table, written into the environment's reusable buffers, so an SB3 model costs one forward pass per
+``num_envs`` decisions instead of one per decision:
+
+    python -m src.evaluation models/PPO_5_000_000_env2.zip --envV 2 --rounds 1000000
+"""
+
+ACTION_COUNT = 4
+
+
+class RunningStats:
+    """
+    Welford accumulator of the mean and variance of a stream of values, mergeable across shards.
+
+    Attributes:
+    - count (int): The number of values.
+    - mean (float): The mean of the values.
+    - m2 (float): The sum of squared differences from the mean.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def _combine(self, count, mean, m2):
+        total = self.count + count
+        if total == 0:
+            return
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+
+    def push(self, value):
+        """
+        Adds one value.
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def update(self, values):
+        """
+        Adds an array of values.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if values.size:
+            mean = float(values.mean())
+            self._combine(values.size, mean, float(np.square(values - mean).sum()))
+
+    def merge(self, other):
+        """
+        Adds the values of another accumulator.
+
+        Returns:
+        - RunningStats: self.
+        """
+        self._combine(other.count, other.mean, other.m2)
+        return self
+
+    @property
+    def variance(self):
+        """
+        Returns the sample variance.
+        """
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        """
+        Returns the sample standard deviation.
+        """
+        return math.sqrt(self.variance)
+
+    def half_width(self, z=1.96):
+        """
+        Returns the half width of the normal confidence interval of the mean.
+
+        Args:
+        - z (float): The z-score of the interval (1.96 for 95%).
+        """
+        return z * self.std / math.sqrt(self.count) if self.count > 1 else math.inf
+
+
+class EvaluationStats:
+    """
+    Summary statistics of evaluated rounds that can be merged across shards.
+
+    Attributes:
+    - rounds (int): The number of rounds played.
+    - played_hands, win, loss, draw (int): The number of hands played, won, lost and drawn.
+    - illegal_moves (int): The number of rounds ended by an illegal move.
+    - money (float): The sum of the rewards.
+    - all_money (float): The sum of the chips put on the table (in units of 100).
+    - action_counts (np.ndarray): The number of times each action (stand, hit, double, split) was taken.
+    - reward (RunningStats): The mean and variance of the reward of a round.
+    """
+
+    def __init__(self):
+        self.rounds = 0
+        self.played_hands = 0
+        self.win = 0
+        self.loss = 0
+        self.draw = 0
+        self.illegal_moves = 0
+        self.money = 0.0
+        self.all_money = 0.0
+        self.action_counts = np.zeros(ACTION_COUNT, dtype=np.int64)
+        self.reward = RunningStats()
+
+    def merge(self, other):
+        """
+        Adds the statistics of another shard to these ones.
+
+        Args:
+        - other (EvaluationStats): The statistics to add.
+
+        Returns:
+        - EvaluationStats: self.
+        """
+        for name in ("rounds", "played_hands", "win", "loss", "draw", "illegal_moves", "money", "all_money"):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        self.action_counts = self.action_counts + other.action_counts
+        self.reward.merge(other.reward)
+        return self
+
+    def add_rewards(self, rewards):
+        """
+        Adds the rewards of finished rounds.
+        """
+        rewards = np.asarray(rewards, dtype=np.float64)
+        self.rounds += rewards.size
+        self.reward.update(rewards)
+
+    @property
+    def reward_sum(self):
+        """
+        Returns the sum of the rewards of every round.
+        """
+        return self.reward.mean * self.reward.count
+
+    @property
+    def reward_sq_sum(self):
+        """
+        Returns the sum of the squared rewards of every round.
+        """
+        return self.reward.m2 + self.reward.mean ** 2 * self.reward.count
+
+    @property
+    def ev(self):
+        """
+        Returns the mean reward per round.
+        """
+        return self.reward.mean
+
+    @property
+    def std(self):
+        """
+        Returns the sample standard deviation of the reward of a round.
+        """
+        return self.reward.std
+
+    def confidence_interval(self, z=1.96):
+        """
+        Returns the normal confidence interval of the mean reward per round.
+
+        Args:
+        - z (float): The z-score of the interval (1.96 for 95%).
+
+        Returns:
+        - tuple: The lower and upper bounds.
+        """
+        half_width = self.reward.half_width(z)
+        return self.ev - half_width, self.ev + half_width
+
+    def summary(self):
+        """
+        Returns the statistics as a dictionary.
+        """
+        hands = max(self.played_hands, 1)
+        low, high = self.confidence_interval()
+        # Same definition as BlackJackEnv.earn_money_rate
+        earn_rate = ((self.all_money - self.money) / 2 + self.money) / self.all_money if self.all_money else 0.0
+        return {
+            "rounds": self.rounds,
+            "played_hands": self.played_hands,
+            "win_rate": self.win / hands,
+            "loss_rate": self.loss / hands,
+            "draw_rate": self.draw / hands,
+            "money": self.money,
+            "earn_money_rate": earn_rate,
+            "loss_money_rate": 1 - earn_rate if self.all_money else 0.0,
+            "illegal_moves": self.illegal_moves,
+            "action_counts": self.action_counts.tolist(),
+            "ev": self.ev,
+            "ev_ci95": (low, high),
+        }
+
+    def __str__(self):
+        return "\n".join(f"{key}: {value}" for key, value in self.summary().items())
+
+
+class PairedStats:
+    """
+    Statistics of two policies played on the same shoes, mergeable across shards.
+
+    Attributes:
+    - stats_a, stats_b (EvaluationStats): The statistics of each policy.
+    - difference (RunningStats): The mean and variance of the reward of policy_a minus policy_b, per round.
+    """
+
+    def __init__(self):
+        self.stats_a = EvaluationStats()
+        self.stats_b = EvaluationStats()
+        self.difference = RunningStats()
+
+    def merge(self, other):
+        """
+        Adds the statistics of another shard to these ones.
+
+        Returns:
+        - PairedStats: self.
+        """
+        self.stats_a.merge(other.stats_a)
+        self.stats_b.merge(other.stats_b)
+        self.difference.merge(other.difference)
+        return self
+
+    def confidence_interval(self, z=1.96):
+        """
+        Returns the normal confidence interval of the EV difference per round.
+        """
+        half_width = self.difference.half_width(z)
+        return self.difference.mean - half_width, self.difference.mean + half_width
+
+    def summary(self):
+        """
+        Returns the EVs, their difference and the paired confidence interval as a dictionary.
+        """
+        return {
+            "rounds": self.difference.count,
+            "ev_a": self.stats_a.ev,
+            "ev_b": self.stats_b.ev,
+            "ev_difference": self.difference.mean,
+            "difference_std": self.difference.std,
+            "difference_ci95": self.confidence_interval(),
+        }
+
+    def __str__(self):
+        return "\n".join(f"{key}: {value}" for key, value in self.summary().items())
+
+
+def _is_sb3_model(policy):
+    return hasattr(policy, "predict") and hasattr(policy, "save") and hasattr(type(policy), "load")
+
+
+def _policy_spec(policy, directory):
+    """
+    Returns a picklable description of a policy. SB3 models are saved to disk and reloaded by the workers,
+    other policies are serialized with cloudpickle so that lambdas and closures reach the workers too.
+    """
+    if _is_sb3_model(policy):
+        path = os.path.join(directory, "policy.zip")
+        policy.save(path)
+        return "sb3", type(policy), path
+    return "pickled", cloudpickle.dumps(policy), None
+
+
+def _load_policy(spec):
+    kind, policy, path = spec
+    if kind == "sb3":
+        return policy.load(path, device="cpu")
+    if kind == "pickled":
+        return cloudpickle.loads(policy)
+    return policy
+
+
+def _split(total, parts):
+    return [total // parts + (index < total % parts) for index in range(parts)]
+
+
+def _play_vector(policy, rounds, seed, env_kwargs, num_envs):
+    """
+    Plays a shard with a batch policy on a vector environment.
+
+    Every table plays an exact quota of rounds and its counters are read when the quota is reached, so the
+    rounds still running when the shard stops do not bias the result.
+    """
+    num_envs = max(1, min(num_envs, rounds))
+    env = BlackJackVectorEnv(num_envs=num_envs, seed=seed, final_observation=False, **env_kwargs)
+    if hasattr(policy, "get_actions"):
+        act = policy.get_actions
+    else:
+        act = lambda obs: policy.predict(obs, deterministic=True)[0]
+
+    stats = EvaluationStats()
+    quota = np.array(_split(rounds, num_envs), dtype=np.int64)
+    completed = np.zeros(num_envs, dtype=np.int64)
+    obs, _ = env.reset()
+    while (completed < quota).any():
+        counting = completed < quota
+        actions = np.asarray(act(obs), dtype=np.int64).reshape(num_envs)
+        stats.action_counts += np.bincount(actions[counting], minlength=ACTION_COUNT)[:ACTION_COUNT]
+        obs, rewards, terminated, truncated, _ = env.step(actions)
+        ended = (terminated | truncated) & counting
+        if ended.any():
+            stats.add_rewards(rewards[ended])
+            completed += ended
+            finished = ended & (completed == quota)
+            for name in ("played_hands", "win", "loss", "draw", "illegal_moves"):
+                setattr(stats, name, getattr(stats, name) + int(getattr(env, name)[finished].sum()))
+            stats.money += float(env.money[finished].sum())
+            stats.all_money += float(env.all_money[finished].sum())
+    return stats
+
+
+def _scalar_actor(policy):
+    """
+    Returns a function ``(env, obs) -> action`` playing a policy on a ``BlackJackEnv``.
+    """
+    if isinstance(policy, Agent):
+        return lambda env, obs: policy.act(env.dealer_hand, env.playingHand)
+    if hasattr(policy, "get_action"):
+        return lambda env, obs: policy.get_action(env.dealer_hand, env.playingHand)
+    if hasattr(policy, "predict"):
+        return lambda env, obs: policy.predict(obs, deterministic=True)[0]
+    return policy
+
+
+def _record_env(stats, env):
+    stats.played_hands, stats.win, stats.loss, stats.draw = env.played_hands, env.win, env.loss, env.draw
+    stats.illegal_moves, stats.money, stats.all_money = env.illegal_moves, env.money, env.all_money
+
+
+def _play_round(env, act, obs, action_counts):
+    """
+    Plays one round and returns its reward.
+    """
+    while True:
+        action = int(act(env, obs))
+        if 0 <= action < ACTION_COUNT:
+            action_counts[action] += 1
+        obs, reward, done, _, _ = env.step(action)
+        if done:
+            return reward
+
+
+def _play_scalar(policy, rounds, seed, env_kwargs):
+    """
+    Plays a shard one round at a time on a ``BlackJackEnv``.
+    """
+    env = BlackJackEnv(**env_kwargs)
+    env.deck.seed(seed)
+    act = _scalar_actor(policy)
+
+    stats = EvaluationStats()
+    rewards = np.zeros(rounds, dtype=np.float64)
+    obs, _ = env.reset()
+    for index in range(rounds):
+        rewards[index] = _play_round(env, act, obs, stats.action_counts)
+        obs, _ = env.reset(full_reset=False)
+    stats.add_rewards(rewards)
+    _record_env(stats, env)
+    return stats
+
+
+def _play_paired(policy_a, policy_b, rounds, seed, env_kwargs):
+    """
+    Plays a shard with two policies on the same shoes.
+
+    Each policy has its own environment, both decks use the same shuffles. After every round the deck that
+    dealt fewer cards burns the difference, so both start the next round from the same card, and they
+    reshuffle at the same time (the hole card draws of the decks stay in step too).
+    """
+    paired = PairedStats()
+    envs = [BlackJackEnv(**env_kwargs), BlackJackEnv(**env_kwargs)]
+    actors = [_scalar_actor(policy_a), _scalar_actor(policy_b)]
+    stats = [paired.stats_a, paired.stats_b]
+    rewards = np.zeros((2, rounds), dtype=np.float64)
+    observations = []
+    for env in envs:
+        env.deck.seed(seed)
+        observations.append(env.reset()[0])
+    for index in range(rounds):
+        for side in (0, 1):
+            rewards[side, index] = _play_round(envs[side], actors[side], observations[side], stats[side].action_counts)
+        cursor = max(env.deck.cursor for env in envs)
+        for side, env in enumerate(envs):
+            env.deck.burn(cursor - env.deck.cursor)
+            observations[side] = env.reset(full_reset=False)[0]
+    for side, env in enumerate(envs):
+        stats[side].add_rewards(rewards[side])
+        _record_env(stats[side], env)
+    paired.difference.update(rewards[0] - rewards[1])
+    return paired
+
+
+def _evaluate_paired_shard(spec_a, spec_b, rounds, seed, env_kwargs):
+    return _play_paired(_load_policy(spec_a), _load_policy(spec_b), rounds, seed, env_kwargs)
+
+
+def _evaluate_shard(spec, rounds, seed, env_kwargs, vectorized, num_envs):
+    policy = _load_policy(spec)
+    if vectorized:
+        return _play_vector(policy, rounds, seed, env_kwargs, num_envs)
+    return _play_scalar(policy, rounds, seed, env_kwargs)
+
+
+class _Evaluator:
+    """
+    Plays batches of rounds with one policy over a shared process pool, each batch on fresh seeded shoes.
+    """
+
+    def __init__(self, policy, pool, directory, seed_sequence, workers, env_kwargs, num_envs):
+        self.policy = policy
+        self.pool = pool
+        if pool is not None:
+            os.makedirs(directory, exist_ok=True)
+            self.spec = _policy_spec(policy, directory)
+        else:
+            self.spec = ("object", policy, None)
+        self.seed_sequence = seed_sequence
+        self.workers = workers
+        self.env_kwargs = env_kwargs
+        self.num_envs = num_envs
+        self.vectorized = not isinstance(policy, Agent) and (hasattr(policy, "get_actions") or hasattr(policy, "predict"))
+
+    def submit(self, rounds):
+        """
+        Starts a batch of rounds and returns a function waiting for its merged statistics.
+        """
+        shards = [count for count in _split(rounds, self.workers) if count]
+        seeds = self.seed_sequence.spawn(len(shards))
+        args = [(self.spec, count, shard_seed, self.env_kwargs, self.vectorized, self.num_envs)
+                for count, shard_seed in zip(shards, seeds)]
+        if self.pool is None:
+            results = [_evaluate_shard(*arguments) for arguments in args]
+            return lambda: _merge(results)
+        futures = [self.pool.submit(_evaluate_shard, *arguments) for arguments in args]
+        return lambda: _merge(future.result() for future in futures)
+
+
+def _merge(results):
+    stats = EvaluationStats()
+    for result in results:
+        stats.merge(result)
+    return stats
+
+
+def _run(policies, seed, workers, env_kwargs, num_envs, play):
+    """
+    Creates one evaluator per policy, sharing a process pool unless a single worker is used, and runs ``play``.
+    """
+    env_kwargs = dict(env_kwargs or {"envV": 1})
+    workers = workers or os.cpu_count() or 1
+    seed_sequences = spawn_seeds(seed, len(policies))
+    with tempfile.TemporaryDirectory() as directory:
+        pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            evaluators = [_Evaluator(policy, pool, os.path.join(directory, str(index)) if pool else directory,
+                                     seed_sequence, workers, env_kwargs, num_envs)
+                          for index, (policy, seed_sequence) in enumerate(zip(policies, seed_sequences))]
+            return play(*evaluators)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+
+def evaluate(policy, rounds, workers=None, seed=None, env_kwargs=None, num_envs=1024):
+    """
+    Evaluates a policy over a number of rounds, sharded over a process pool.
+
+    Args:
+    - policy: An ``Agent``, a ``WikipediaAgent``, an SB3 model, an object with ``get_actions`` or ``predict``, or a
+      function ``(env, obs) -> action`` (lambdas and closures included, they are sent to the workers with
+      cloudpickle).
+    - rounds (int): The total number of rounds to play.
+    - workers (int): The number of worker processes (default: the number of CPUs); 1 plays in this process.
+    - seed (int): Optional seed; every shard gets an independent stream spawned from it.
+    - env_kwargs (dict): Arguments of the environments, e.g. ``{"envV": 3}``.
+    - num_envs (int): The number of tables of every shard's vector environment (batch policies only).
+
+    Returns:
+    - EvaluationStats: The merged statistics of every shard.
+    """
+    return _run([policy], seed, workers, env_kwargs, num_envs, lambda evaluator: evaluator.submit(rounds)())
+
+
+def paired_evaluate(policy_a, policy_b, rounds, workers=None, seed=None, env_kwargs=None):
+    """
+    Evaluates two policies on identical shoes and reports the difference of their EVs.
+
+    Both policies play every round from the same shoe position, with separate environments so that their
+    different actions consume cards independently within the round. Every policy is played one round at a
+    time on a ``BlackJackEnv``.
+
+    Args:
+    - policy_a, policy_b: The policies, see ``evaluate``.
+    - rounds (int): The number of rounds played by each policy.
+    - workers (int): The number of worker processes (default: the number of CPUs); 1 plays in this process.
+    - seed (int): Optional seed; every shard gets an independent stream of shoes spawned from it.
+    - env_kwargs (dict): Arguments of the environments, e.g. ``{"envV": 3}``.
+
+    Returns:
+    - PairedStats: The merged statistics of every shard.
+    """
+    env_kwargs = dict(env_kwargs or {"envV": 1})
+    workers = workers or os.cpu_count() or 1
+    shards = [count for count in _split(rounds, workers) if count]
+    seeds = spawn_seeds(seed, len(shards))
+    paired = PairedStats()
+    if workers == 1 or len(shards) == 1:
+        for count, shard_seed in zip(shards, seeds):
+            paired.merge(_play_paired(policy_a, policy_b, count, shard_seed, env_kwargs))
+        return paired
+
+    with tempfile.TemporaryDirectory() as directory:
+        specs = []
+        for index, policy in enumerate((policy_a, policy_b)):
+            os.makedirs(os.path.join(directory, str(index)))
+            specs.append(_policy_spec(policy, os.path.join(directory, str(index))))
+        with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+            futures = [pool.submit(_evaluate_paired_shard, *specs, count, shard_seed, env_kwargs)
+                       for count, shard_seed in zip(shards, seeds)]
+            for future in futures:
+                paired.merge(future.result())
+    return paired
+
+
+def evaluate_until(policy, ci_width=0.01, z=1.96, batch_rounds=100_000, max_rounds=100_000_000, workers=None,
+                   seed=None, env_kwargs=None, num_envs=1024):
+    """
+    Evaluates a policy in batches until the confidence interval of its EV per round is narrow enough.
+
+    Args:
+    - policy: The policy, see ``evaluate``.
+    - ci_width (float): The target width of the confidence interval (upper bound minus lower bound).
+    - z (float): The z-score of the interval (1.96 for 95%).
+    - batch_rounds (int): The number of rounds played between two checks.
+    - max_rounds (int): The number of rounds after which the evaluation stops anyway.
+    - workers, seed, env_kwargs, num_envs: See ``evaluate``.
+
+    Returns:
+    - EvaluationStats: The statistics of every round played.
+    """
+    def play(evaluator):
+        stats = EvaluationStats()
+        while stats.rounds < max_rounds and 2 * stats.reward.half_width(z) > ci_width:
+            stats.merge(evaluator.submit(min(batch_rounds, max_rounds - stats.rounds))())
+        return stats
+
+    return _run([policy], seed, workers, env_kwargs, num_envs, play)
+
+
+def compare_until(policy_a, policy_b, alpha=0.05, min_difference=0.0, batch_rounds=100_000,
+                  max_rounds=100_000_000, workers=None, seed=None, env_kwargs=None, num_envs=1024):
+    """
+    Evaluates two policies side by side until the difference of their EVs is significant.
+
+    The policies play on independent shoes, and after every batch a two-sided z-test on the difference of the
+    mean rewards per round is made. The evaluation stops when the difference is significant at ``alpha``, or
+    when the confidence interval of the difference fits within ``min_difference`` of zero (the policies are
+    as good as each other), or after ``max_rounds`` rounds per policy. The test is repeated after every
+    batch without correction, so use large batches or a small ``alpha``.
+
+    Args:
+    - policy_a, policy_b: The policies, see ``evaluate``.
+    - alpha (float): The significance level of the test.
+    - min_difference (float): The EV difference per round below which the policies are considered equal.
+    - batch_rounds (int): The number of rounds played by each policy between two checks.
+    - max_rounds (int): The number of rounds per policy after which the evaluation stops anyway.
+    - workers, seed, env_kwargs, num_envs: See ``evaluate``.
+
+    Returns:
+    - tuple: The statistics of both policies, and 1 if policy_a is better, -1 if policy_b is better, 0 otherwise.
+    """
+    z = NormalDist().inv_cdf(1 - alpha / 2)
+
+    def play(evaluator_a, evaluator_b):
+        stats_a, stats_b = EvaluationStats(), EvaluationStats()
+        while stats_a.rounds < max_rounds:
+            rounds = min(batch_rounds, max_rounds - stats_a.rounds)
+            pending = evaluator_a.submit(rounds), evaluator_b.submit(rounds)
+            stats_a.merge(pending[0]())
+            stats_b.merge(pending[1]())
+            difference = stats_a.ev - stats_b.ev
+            half_width = z * math.sqrt(stats_a.reward.variance / stats_a.rounds + stats_b.reward.variance / stats_b.rounds)
+            if abs(difference) > half_width:
+                return stats_a, stats_b, 1 if difference > 0 else -1
+            if half_width <= min_difference:
+                break
+        return stats_a, stats_b, 0
+
+    return _run([policy_a, policy_b], seed, workers, env_kwargs, num_envs, play)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Evaluates the Wikipedia strategy or a saved SB3 model.")
+    parser.add_argument("model", nargs="?", default=None, help="A PPO or DQN zip file, the Wikipedia strategy by default.")
+    parser.add_argument("--algorithm", choices=["ppo", "dqn"], default="ppo")
+    parser.add_argument("--envV", type=int, default=1)
+    parser.add_argument("--obs-mode", choices=["dict", "flat"], default="dict")
+    parser.add_argument("--rounds", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--num-envs", type=int, default=1024, help="The tables played in lockstep by every worker.")
+    parser.add_argument("--seed", type=int, default=0)
+    arguments = parser.parse_args()
+
+    if arguments.model is None:
+        from src.wikipedia_agent import WikipediaAgent
+
+        evaluated = WikipediaAgent()
+    else:
+        from stable_baselines3 import PPO, DQN
+
+        evaluated = (PPO if arguments.algorithm == "ppo" else DQN).load(arguments.model, device="cpu")
+    start = time.perf_counter()
+    stats = evaluate(evaluated, arguments.rounds, arguments.workers, arguments.seed,
+                     {"envV": arguments.envV, "obs_mode": arguments.obs_mode}, arguments.num_envs)
+    print(stats)
+    print(f"rounds_per_second: {stats.rounds / (time.perf_counter() - start):.0f}")
@@ -28,6 +28,11 @@ class Hand:
     - done (bool): A boolean indicating if the hand is complete.
     - case (str): The outcome of the hand (WIN, LOSS, DRAW, UNCLEAR).
     - splitted (bool): A boolean indicating if the hand has been split.
+    - hard_total (int): The total of the visible cards, counting every ace as 1.
+    - ace_count (int): The number of visible aces.
+    - value (int): The best total of the visible cards (what get_value returns).
+    - soft (bool): Whether an ace is currently counted as 11.
+    - pair (bool): Whether the hand is exactly two cards of the same rank.
     """
 
     def __init__(self, chip: Chip):
@@ -40,6 +45,31 @@ class Hand:
         self.case = Outcome.UNCLEAR
         self.doubled = False
         self.splitted = False
+        self.hard_total = 0
+        self.ace_count = 0
+        self.value = 0
+        self.soft = False
+        self.pair = False
+
+    def clear(self, chip: Chip = None):
+        """
+        Empties the hand in place so it can be reused for a new round.
+
+        Args:
+        - chip (Chip): Optional chip to bet on the hand, the current chip is kept otherwise.
+        """
+        self.cards.clear()
+        if chip is not None:
+            self.chip = chip
+        self.done = False
+        self.case = Outcome.UNCLEAR
+        self.doubled = False
+        self.splitted = False
+        self.hard_total = 0
+        self.ace_count = 0
+        self.value = 0
+        self.soft = False
+        self.pair = False
 
     def add_card(self, card: Card):
         """
@@ -49,6 +79,31 @@ class Hand:
         - card (Card): The Card object to add to the hand.
         """
         self.cards.append(card)
+        self.pair = len(self.cards) == 2 and self.cards[0].rank_index == card.rank_index
+        if not card.hidden:
+            self._count(card)
+
+    def reveal(self):
+        """
+        Turns every hidden card of the hand face up (e.g., the dealer's hole card).
+        """
+        for card in self.cards:
+            if card.hidden:
+                card.hidden = False
+                self._count(card)
+
+    def _count(self, card: Card):
+        """
+        Adds a visible card to the running totals.
+        """
+        if card.is_ace:
+            self.hard_total += 1
+            self.ace_count += 1
+        else:
+            self.hard_total += card.value
+        # At most one ace can count as 11 without busting the hand.
+        self.soft = self.ace_count > 0 and self.hard_total + 10 <= 21
+        self.value = self.hard_total + 10 if self.soft else self.hard_total
 
     def get_value(self):
         """
@@ -57,16 +112,7 @@ class Hand:
         Returns:
         - int: The total value of the hand.
         """
-
-        cards = [card for card in self.cards if not card.hidden]
-
-        total_value = sum(card.value for card in cards)
-        # Check for aces and adjust their value if needed
-        num_aces = sum(1 for card in cards if card.rank == 'Ace')
-        while total_value > 21 and num_aces:
-            total_value -= 10
-            num_aces -= 1
-        return total_value
+        return self.value
 
     def is_busted(self):
         """
@@ -75,7 +121,7 @@ class Hand:
         Returns:
         - bool: True if the hand is busted, False otherwise.
         """
-        if self.get_value() > 21:
+        if self.value > 21:
 
             self.done = True
             self.case = Outcome.LOSS
@@ -89,8 +135,8 @@ class Hand:
         Returns:
         - bool: True if the hand is win, False otherwise.
         """
-        hand_value = self.get_value()
-        dealer_value = dealer_hand.get_value()
+        hand_value = self.value
+        dealer_value = dealer_hand.value
 
         if hand_value > 21:
             return Outcome.LOSS
@@ -132,7 +178,7 @@ class Hand:
         Returns:
         - bool: True if the hand has exactly two cards with the same rank, False otherwise.
         """
-        return len(self.cards) == 2 and self.cards[0].rank == self.cards[1].rank and not self.splitted
+        return self.pair and not self.splitted
 
     def is_soft_hand(self):
         """
@@ -141,30 +187,13 @@ class Hand:
         Returns:
         - bool: True if the hand is a soft hand, False otherwise.
         """
-        cards = [card for card in self.cards if not card.hidden]
-
-        total_value = sum(card.value for card in cards)
-
-        num_aces = sum(1 for card in cards if card.rank == 'Ace')
-        while total_value > 21 and num_aces:
-            total_value -= 10
-            num_aces -= 1
-        return num_aces > 0
+        return self.soft
 
     def usable_ace_count(self):
         """
         Returns the number of usable aces in the hand.
         """
-        cards = [card for card in self.cards if not card.hidden]
-
-        total_value = sum(card.value for card in cards)
-
-        num_aces = sum(1 for card in cards if card.rank == 'Ace')
-        while total_value > 21 and num_aces:
-            total_value -= 10
-            num_aces -= 1
-
-        return num_aces
+        return 1 if self.soft else 0
 
 
     def __str__(self):
@@ -0,0 +1,74 @@
+import numpy as np
+from gymnasium.vector.utils import spaces
+
+
+class FlatObservation:
+    """
+    Writes the fields of a Dict observation space into one reusable float32 vector.
+
+    Discrete fields are either one-hot encoded (the same encoding SB3's ``MultiInputPolicy`` applies to them)
+    or written as a single value, Box fields are written as they are. The fields keep the order of the Dict
+    space, so a flat observation can be fed to a plain ``MlpPolicy``.
+
+    Attributes:
+    - space (spaces.Box): The flat observation space of a single observation.
+    - buffer (np.ndarray): The vector the fields are written into, shape (size,) or (batch_size, size).
+    - fields (dict): The offset, size and one-hot flag of every field.
+    """
+
+    def __init__(self, observation_space: spaces.Dict, one_hot=True, batch_size=None):
+        """
+        Initializes the layout of the flat observation.
+
+        Args:
+        - observation_space (spaces.Dict): The Dict observation space to flatten.
+        - one_hot (bool): Whether Discrete fields are one-hot encoded.
+        - batch_size (int): Optional number of observations written at once (for vector environments).
+        """
+        self.fields = {}
+        low, high = [], []
+        offset = 0
+        for key, space in observation_space.spaces.items():
+            if isinstance(space, spaces.Discrete) and one_hot:
+                size = int(space.n)
+                low += [0] * size
+                high += [1] * size
+            elif isinstance(space, spaces.Discrete):
+                size = 1
+                low.append(space.start)
+                high.append(space.start + space.n - 1)
+            elif isinstance(space, spaces.Box):
+                size = int(np.prod(space.shape))
+                low += list(space.low.ravel())
+                high += list(space.high.ravel())
+            else:
+                raise TypeError(f"Unsupported observation space for field '{key}': {space}")
+            self.fields[key] = (offset, size, one_hot and isinstance(space, spaces.Discrete))
+            offset += size
+
+        self.size = offset
+        self.batch_size = batch_size
+        self.space = spaces.Box(low=np.array(low, dtype=np.float32), high=np.array(high, dtype=np.float32), dtype=np.float32)
+        self.buffer = np.zeros(self.size if batch_size is None else (batch_size, self.size), dtype=np.float32)
+        self._rows = None if batch_size is None else np.arange(batch_size)
+
+    def write(self, key, value):
+        """
+        Writes a field into the buffer.
+
+        Args:
+        - key (str): The name of the field.
+        - value: The value of the field, or an array of values (one per row) when batched.
+        """
+        offset, size, one_hot = self.fields[key]
+        if one_hot:
+            region = self.buffer[..., offset:offset + size]
+            region.fill(0)
+            if self._rows is None:
+                region[min(int(value), size - 1)] = 1
+            else:
+                region[self._rows, np.minimum(value, size - 1).astype(np.intp)] = 1
+        elif size == 1:
+            self.buffer[..., offset] = value
+        else:
+            self.buffer[..., offset:offset + size] = value
@@ -0,0 +1,157 @@
+import sys
+from time import perf_counter_ns
+
+import numpy as np
+
+"""
+Phase profiler
+
+Times the phases of a round with ``perf_counter_ns`` and, optionally, counts the memory blocks they leave
+allocated with ``sys.getallocatedblocks``. Counting blocks walks every arena of the allocator, which costs
+microseconds per call, so it is off by default. The last ``window`` samples of every phase are kept in ring
+buffers, so the summaries returned by ``PhaseProfiler.summary`` describe recent behaviour during long
+training runs.
+Methods are instrumented by replacing them on the instance, so an object that is never instrumented runs
+its original code without any check.
+"""
+
+
+class PhaseProfiler:
+    """
+    Rolling per-phase timings and allocation counts.
+
+    Attributes:
+    - window (int): The number of recent samples kept for every phase.
+    - count_allocations (bool): Whether the allocated blocks of every phase are counted.
+    - times (dict): The ring buffer of durations (ns) of every phase.
+    - blocks (dict): The ring buffer of allocated block deltas of every phase.
+    - counts (dict): The number of samples recorded for every phase since the last ``clear``.
+    - current (dict): The durations (ns) recorded since the last ``begin``, summed per phase.
+    """
+
+    def __init__(self, window=10000, count_allocations=False):
+        """
+        Initializes an empty profiler.
+
+        Args:
+        - window (int): The number of recent samples kept for every phase.
+        - count_allocations (bool): Whether to count the allocated blocks of every phase (slower).
+        """
+        self.window = window
+        self.count_allocations = count_allocations
+        self.times = {}
+        self.blocks = {}
+        self.counts = {}
+        self.current = {}
+
+    def clear(self):
+        """
+        Drops every recorded sample.
+        """
+        self.times.clear()
+        self.blocks.clear()
+        self.counts.clear()
+        self.current.clear()
+
+    def begin(self):
+        """
+        Starts a new step: ``current`` only holds the phases recorded from now on.
+        """
+        self.current = {}
+
+    def record(self, phase, duration, blocks):
+        """
+        Records one sample of a phase.
+
+        Args:
+        - phase (str): The name of the phase.
+        - duration (int): The duration of the phase in nanoseconds.
+        - blocks (int): The number of memory blocks allocated (minus freed) during the phase, 0 if not counted.
+        """
+        count = self.counts.get(phase, 0)
+        if count == 0:
+            self.times[phase] = [0] * self.window
+            self.blocks[phase] = [0] * self.window
+        index = count % self.window
+        self.times[phase][index] = duration
+        self.blocks[phase][index] = blocks
+        self.counts[phase] = count + 1
+        self.current[phase] = self.current.get(phase, 0) + duration
+
+    def wrap(self, phase, method):
+        """
+        Returns a function calling ``method`` and recording its duration and allocations under ``phase``.
+        """
+        record = self.record
+        allocated_blocks = sys.getallocatedblocks
+
+        if self.count_allocations:
+            def timed(*args, **kwargs):
+                blocks = allocated_blocks()
+                start = perf_counter_ns()
+                result = method(*args, **kwargs)
+                record(phase, perf_counter_ns() - start, allocated_blocks() - blocks)
+                return result
+        else:
+            def timed(*args, **kwargs):
+                start = perf_counter_ns()
+                result = method(*args, **kwargs)
+                record(phase, perf_counter_ns() - start, 0)
+                return result
+
+        timed.__wrapped__ = method
+        return timed
+
+    def instrument(self, obj, phases):
+        """
+        Replaces methods of an object with timed versions.
+
+        Args:
+        - obj: The object to instrument.
+        - phases (dict): The name of the phase of every method, e.g. {"dealer_play": "dealer"}.
+        """
+        for name, phase in phases.items():
+            setattr(obj, name, self.wrap(phase, getattr(obj, name)))
+
+    def summary(self, bins=None):
+        """
+        Summarizes the recent samples of every phase.
+
+        Args:
+        - bins (list): Optional edges (ns) of the duration histograms. Defaults to powers of two from 128ns to ~1s.
+
+        Returns:
+        - dict: For every phase, the number of samples (``count`` in total, ``samples`` in the window), the mean,
+          median, 90th and 99th percentiles and maximum duration in ns, the mean allocated blocks (0 unless
+          ``count_allocations``) and the duration histogram of the window (``edges_ns`` and ``histogram``).
+        """
+        edges = np.array(bins if bins is not None else [2 ** k for k in range(7, 31)], dtype=np.int64)
+        profile = {}
+        for phase, count in self.counts.items():
+            samples = min(count, self.window)
+            times = np.array(self.times[phase][:samples], dtype=np.int64)
+            blocks = np.array(self.blocks[phase][:samples], dtype=np.int64)
+            p50, p90, p99 = np.percentile(times, (50, 90, 99))
+            profile[phase] = {
+                "count": count,
+                "samples": samples,
+                "mean_ns": float(times.mean()),
+                "p50_ns": float(p50),
+                "p90_ns": float(p90),
+                "p99_ns": float(p99),
+                "max_ns": int(times.max()),
+                "mean_blocks": float(blocks.mean()),
+                "edges_ns": edges.tolist(),
+                "histogram": np.histogram(np.clip(times, edges[0], edges[-1]), bins=edges)[0].tolist(),
+            }
+        return profile
+
+    def __str__(self):
+        """
+        Returns a table of the recent timings of every phase.
+        """
+        lines = [f"{'phase':<12}{'count':>10}{'mean us':>10}{'p50 us':>10}{'p99 us':>10}{'blocks':>8}"]
+        for phase, stats in self.summary().items():
+            lines.append(f"{phase:<12}{stats['count']:>10}{stats['mean_ns'] / 1000:>10.2f}{stats['p50_ns'] / 1000:>10.2f}"
+                         f"{stats['p99_ns'] / 1000:>10.2f}{stats['mean_blocks']:>8.2f}")
+        return "\n".join(lines)
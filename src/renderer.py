@@ -0,0 +1,253 @@
+import os
+
+import numpy as np
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import pygame
+
+from src.card import Card, NUM_CODES
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "assets")
+
+BACKGROUND = (0, 128, 0)
+WHITE = (255, 255, 255)
+
+
+class Renderer:
+    """
+    Pygame renderer for the Blackjack environment.
+
+    The card images are loaded and scaled once into an atlas, fonts and text surfaces are cached, and every
+    frame only redraws the screen regions whose content changed since the previous frame.
+
+    In "human" mode the game is drawn in a window limited to ``fps`` frames per second. In "rgb_array" mode it
+    is drawn on an off-screen surface without any display or throttling, and every frame is returned as a
+    (height, width, 3) uint8 array.
+
+    Attributes:
+    - mode (str): The render mode, "human" or "rgb_array".
+    - screen: The Pygame surface the game is drawn on (the window in "human" mode).
+    - clock: The Pygame clock limiting the frame rate ("human" mode only).
+    - fps (float): The frame rate of the window.
+    - frame_skip (int): Only every ``frame_skip``-th call draws a new frame, the others repeat the last one.
+    - atlas (list): The scaled card surfaces indexed by card code.
+    - card_back: The scaled surface of the card back.
+    """
+
+    def __init__(self, fps=1, mode="human", frame_skip=1, width=800, height=600, card_width=50, card_height=80):
+        """
+        Opens the window (or the off-screen surface) and loads the card atlas.
+
+        Args:
+        - fps (float): The frame rate of the window.
+        - mode (str): The render mode, "human" or "rgb_array".
+        - frame_skip (int): Draw a new frame only every ``frame_skip`` calls.
+        - width (int): The width of the window.
+        - height (int): The height of the window.
+        - card_width (int): The width of a card on screen.
+        - card_height (int): The height of a card on screen.
+        """
+        self.mode = mode
+        if mode == "human":
+            pygame.init()
+            pygame.display.set_caption("BlackJack")
+            self.screen = pygame.display.set_mode((width, height))
+            self.clock = pygame.time.Clock()
+        elif mode == "rgb_array":
+            # Only fonts are needed off-screen, so no display (and no video driver) is initialized.
+            pygame.font.init()
+            self.screen = pygame.Surface((width, height))
+            self.clock = None
+        else:
+            raise ValueError(f"Unsupported render mode: {mode}")
+        self.fps = fps
+        self.frame_skip = max(1, int(frame_skip))
+        self._calls = 0
+        self._last_frame = None
+
+        self.screenWidth, self.screenHeight = self.screen.get_size()
+        self.cardWidth = card_width
+        self.cardHeight = card_height
+
+        self.atlas = [self._load_card(os.path.basename(Card.from_code(code).get_asset_path())) for code in range(NUM_CODES)]
+        self.card_back = self._load_card("cardback.png")
+
+        self.circle_font = pygame.font.SysFont(None, 24)
+        self.panel_font = pygame.font.SysFont("Arial", 12)
+        self.result_font = pygame.font.Font(None, 36)
+        self._text_cache = {}
+
+        self.dealer_rect = pygame.Rect(self.screenWidth / 2 - 150, 0, 300, 190)
+        self.seats_rect = pygame.Rect(0, 280, self.screenWidth, self.screenHeight - 280)
+        self.stats_rect = pygame.Rect(10, 10, 130, 220)
+        self.prob_rect = pygame.Rect(self.screenWidth - 110, 10, 100, 220)
+        self.result_rect = pygame.Rect(0, 0, self.screenWidth / 2.5, self.screenHeight / 3)
+        self.result_rect.center = (self.screenWidth / 2, self.screenHeight / 2)
+        self.panel = pygame.Surface((130, 220), pygame.SRCALPHA)
+
+        self._signatures = {}
+
+    def _load_card(self, file_name):
+        image = pygame.transform.scale(pygame.image.load(os.path.join(ASSETS_DIR, file_name)), (self.cardWidth, self.cardHeight))
+        return image.convert_alpha() if self.mode == "human" else image
+
+    def _text(self, font, text, color):
+        """
+        Returns a cached text surface.
+        """
+        key = (id(font), text, color)
+        surface = self._text_cache.get(key)
+        if surface is None:
+            if len(self._text_cache) > 4096:
+                self._text_cache.clear()
+            surface = font.render(text, True, color)
+            self._text_cache[key] = surface
+        return surface
+
+    def render(self, env):
+        """
+        Draws the current state of the environment, redrawing only the regions that changed.
+
+        Args:
+        - env (BlackJackEnv): The environment to draw.
+
+        Returns:
+        - np.ndarray: The frame in "rgb_array" mode, None in "human" mode.
+        """
+        self._calls += 1
+        if self._calls % self.frame_skip != 0 and self._signatures:
+            return self._last_frame
+
+        if self.mode == "human":
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    exit()
+            self.clock.tick(self.fps)
+
+        regions = (
+            ("dealer", self.dealer_rect, self._dealer_signature(env), self._draw_dealer),
+            ("seats", self.seats_rect, self._seats_signature(env), self._draw_seats),
+            ("stats", self.stats_rect, self._stats_signature(env), self._draw_stats),
+            ("prob", self.prob_rect, tuple(round(p, 4) for p in env.deck.probability_of_cards()), self._draw_prob),
+        )
+        result = env.reward if env.done else None
+
+        first_frame = not self._signatures
+        if first_frame:
+            self.screen.fill(BACKGROUND)
+
+        dirty = []
+        if first_frame or self._signatures.get("result") != result:
+            # The result box appeared or disappeared, repaint it and every region it covers.
+            self._signatures["result"] = result
+            self.screen.fill(BACKGROUND, self.result_rect)
+            dirty.append(self.result_rect)
+            for name, rect, signature, draw in regions:
+                if rect.colliderect(self.result_rect):
+                    self._signatures.pop(name, None)
+
+        for name, rect, signature, draw in regions:
+            if name not in self._signatures or self._signatures[name] != signature:
+                self._signatures[name] = signature
+                self.screen.fill(BACKGROUND, rect)
+                draw(env)
+                dirty.append(rect)
+
+        if result is not None and dirty:
+            self._draw_result(env)
+            dirty.append(self.result_rect)
+
+        if self.mode == "rgb_array":
+            if dirty or self._last_frame is None:
+                pixels = pygame.surfarray.pixels3d(self.screen)
+                self._last_frame = np.ascontiguousarray(pixels.transpose(1, 0, 2))
+                del pixels
+            return self._last_frame
+
+        if first_frame:
+            pygame.display.flip()
+        elif dirty:
+            pygame.display.update(dirty)
+
+    def draw_circle(self, value, x, y, color=(0, 0, 0)):
+        pygame.draw.circle(self.screen, color, (int(x), int(y)), 12)
+        text_surface = self._text(self.circle_font, str(value), WHITE)
+        self.screen.blit(text_surface, text_surface.get_rect(center=(int(x), int(y))))
+
+    def _dealer_signature(self, env):
+        return tuple((card.code, card.hidden) for card in env.dealer_hand.cards)
+
+    def _seats_signature(self, env):
+        return tuple(
+            tuple((tuple(card.code for card in hand.cards), hand.done, hand.doubled) for hand in seat.hands)
+            for seat in env.table.seats
+        )
+
+    def _stats_signature(self, env):
+        return (env.played_hands, env.win, env.loss, env.draw, env.money, env.earn_money_rate, env.loss_money_rate)
+
+    def _draw_dealer(self, env):
+        for indexCard, card in enumerate(env.dealer_hand.cards):
+            image = self.card_back if card.hidden else self.atlas[card.code]
+            self.screen.blit(image, ((self.screenWidth / 2) + (indexCard * 10) - (self.cardWidth / 2), 70 - (indexCard * 10)))
+        if env.dealer_hand.cards:
+            self.draw_circle(env.dealer_hand.get_value(), self.screenWidth / 2, 170)
+
+    def _draw_seats(self, env):
+        num_seats = len(env.table.seats)
+        seat_space = self.screenWidth / num_seats
+        order = True
+        for indexSeat, seat in enumerate(env.table.seats):
+            splited_hand = len(seat.hands) == 2
+            for indexHand, hand in enumerate(seat.hands):
+                main_space = (self.screenWidth - ((indexSeat + 1) * seat_space - (seat_space / 2)))
+                if splited_hand:
+                    if indexHand == 0:
+                        main_space = main_space + (seat_space / 4)
+                    else:
+                        main_space = main_space - (seat_space / 4)
+                for indexCard, card in enumerate(hand.cards):
+                    self.screen.blit(self.atlas[card.code], (main_space + (indexCard * 10) - (self.cardWidth / 2), (self.screenHeight - 150) - (indexCard * 10)))
+
+                if not hand.done and order:
+                    color = (255, 165, 0)
+                    order = False
+                elif not hand.done:
+                    color = (0, 255, 0)
+                else:
+                    color = (255, 0, 0)
+                self.draw_circle(hand.get_value(), main_space, self.screenHeight - 40, color)
+                if hand.doubled:
+                    self.draw_circle("2x", main_space, self.screenHeight - 15)
+
+    def _draw_panel(self, rect, lines):
+        panel = self.panel
+        panel.fill((0, 0, 0, 0))
+        panel.fill((0, 0, 0, 128), pygame.Rect(0, 0, rect.width, rect.height))  # Şeffaf dikdörtgen
+        for i, text in enumerate(lines):
+            panel.blit(self._text(self.panel_font, text, WHITE), (10, 10 + i * 20))
+        self.screen.blit(panel, rect.topleft, pygame.Rect(0, 0, rect.width, rect.height))
+
+    def _draw_prob(self, env):
+        self._draw_panel(self.prob_rect, [f"{i + 2}: {100 * probability:.2f} %" for i, probability in enumerate(env.deck.probability_of_cards())])
+
+    def _draw_stats(self, env):
+        self._draw_panel(self.stats_rect, [
+            f"Games: {env.played_hands}",
+            f"Win: {env.win}",
+            f"Lose: {env.loss}",
+            f"Draw: {env.draw}",
+            "-" * 20,
+            f"Money: {env.money * 100}",
+            f"Earn Rate: {100 * env.earn_money_rate:.2f} %",
+            f"Loss Rate: {100 * env.loss_money_rate:.2f} %",
+        ])
+
+    def _draw_result(self, env):
+        color = (0, 255, 0) if env.reward > 0 else (255, 0, 0)
+        pygame.draw.rect(self.screen, (169, 169, 169), self.result_rect)
+        text_surface = self.result_font.render("Reward: " + str(env.reward), True, color)
+        self.screen.blit(text_surface, text_surface.get_rect(center=(self.screenWidth / 2, self.screenHeight / 2)))
+
+    def close(self):
+        pygame.quit()
@@ -1,3 +1,4 @@
+from src.chip import Chip
 from src.hand import Hand
 
 
@@ -7,6 +8,7 @@ class Seat:
 
     Attributes:
     - hands (list): A list of Hand objects representing the hands at the seat.
+    - split_slot (Hand): A preallocated hand that becomes the second hand when the seat splits.
     """
 
     def __init__(self):
@@ -14,6 +16,7 @@ class Seat:
         Initializes a seat with no hands.
         """
         self.hands: list[Hand] = []
+        self.split_slot = Hand(chip=Chip(0))
 
     def add_hand(self, hand):
         """
@@ -40,15 +43,31 @@ class Seat:
             #print("You need 2 cards to split.")
             return False
 
-        hand_one = Hand(chip=self.hands[0].chip)
+        # Both hands keep betting the same chip, the first hand is reused and the second comes from the split slot.
+        hand_one = self.hands[0]
+        first_card, second_card = hand_one.cards
+        hand_one.clear()
         hand_one.splitted = True
-        hand_one.add_card(self.hands[0].cards[0])
-        hand_two = Hand(chip=self.hands[0].chip)
+        hand_one.add_card(first_card)
+        hand_two = self.split_slot
+        hand_two.clear(chip=hand_one.chip)
         hand_two.splitted = True
-        hand_two.add_card(self.hands[0].cards[1])
-        self.hands = [hand_one, hand_two]
+        hand_two.add_card(second_card)
+        self.hands.append(hand_two)
         return True
 
+    def reset(self, chip_amount):
+        """
+        Clears the seat in place for a new round, keeping only its first hand.
+
+        Args:
+        - chip_amount (int): The chip amount bet on the first hand.
+        """
+        del self.hands[1:]
+        hand = self.hands[0]
+        hand.clear()
+        hand.chip.reset(chip_amount)
+
     def __str__(self):
         """
         Returns a string representation of the seat (list of hand strings).
@@ -0,0 +1,61 @@
+import numpy as np
+
+"""
+Seeding helpers
+
+Every environment and deck owns a NumPy ``Generator`` built from a ``SeedSequence``. A seed can be None (fresh
+OS entropy), an int, a ``SeedSequence`` or a ``Generator``. Parallel workers get independent substreams
+with ``spawn_seeds``: spawned sequences never overlap, unlike ``seed + rank`` offsets fed to a plain generator.
+"""
+
+
+def make_seed_sequence(seed=None):
+    """
+    Returns the SeedSequence of a seed.
+
+    Args:
+    - seed: None, an int, a SeedSequence, or a Generator (a child of its bit generator's seed sequence is spawned).
+
+    Returns:
+    - np.random.SeedSequence: The seed sequence.
+    """
+    if isinstance(seed, np.random.SeedSequence):
+        return seed
+    if isinstance(seed, np.random.Generator):
+        return seed.bit_generator.seed_seq.spawn(1)[0]
+    return np.random.SeedSequence(seed)
+
+
+def make_rng(seed=None):
+    """
+    Returns a new Generator for a seed (see ``make_seed_sequence``).
+    """
+    return np.random.Generator(np.random.PCG64(make_seed_sequence(seed)))
+
+
+def spawn_seeds(seed, count):
+    """
+    Returns independent child seed sequences, one per worker or environment.
+
+    Args:
+    - seed: The parent seed (see ``make_seed_sequence``).
+    - count (int): The number of children.
+
+    Returns:
+    - list: The child SeedSequences.
+    """
+    return make_seed_sequence(seed).spawn(count)
+
+
+def spawn_int_seeds(seed, count):
+    """
+    Returns independent integer seeds, for APIs that only take ints (e.g. ``VecEnv.seed`` or ``reset(seed=...)``).
+
+    Args:
+    - seed: The parent seed (see ``make_seed_sequence``).
+    - count (int): The number of seeds.
+
+    Returns:
+    - list: The seeds, 32-bit unsigned ints.
+    """
+    return [int(child.generate_state(1)[0]) for child in spawn_seeds(seed, count)]
@@ -0,0 +1,147 @@
+import numpy as np
+
+from src.card import NUM_CODES
+
+"""
+Shoe bank
+
+Pre-shuffled shoes stored in a ``.npy`` file of card codes, shape (count, 52 * num_decks) and dtype uint8.
+A ``ShoeBank`` reads the file through a memory map and hands out one shoe per shuffle, so a ``Deck`` or a
+``BlackJackVectorEnv`` created with ``shoe_source=ShoeBank(...)`` deals the same cards on every machine
+without shuffling. Parallel readers share the file: give each one its own ``offset`` (and a ``stride``
+equal to the number of readers to interleave them).
+
+    python -m src.shoe_bank shoes.npy 1000000 --seed 0
+"""
+
+
+def generate_shoe_bank(path, count, num_decks=8, seed=None, chunk_size=65536):
+    """
+    Writes ``count`` shuffled shoes to a ``.npy`` file.
+
+    Args:
+    - path (str): The file to write.
+    - count (int): The number of shoes.
+    - num_decks (int): The number of decks in every shoe.
+    - seed (int): Optional seed of the shuffles.
+    - chunk_size (int): The number of shoes shuffled at once.
+
+    Returns:
+    - str: The path of the file.
+    """
+    rng = np.random.default_rng(seed)
+    shoes = np.lib.format.open_memmap(path, mode="w+", dtype=np.uint8, shape=(count, NUM_CODES * num_decks))
+    sorted_shoe = np.tile(np.arange(NUM_CODES, dtype=np.uint8), num_decks)
+    for start in range(0, count, chunk_size):
+        stop = min(start + chunk_size, count)
+        shoes[start:stop] = rng.permuted(np.broadcast_to(sorted_shoe, (stop - start, sorted_shoe.size)), axis=1)
+    shoes.flush()
+    del shoes
+    return path
+
+
+class ShoeBank:
+    """
+    Shoe source dealing the pre-shuffled shoes of a memory-mapped shoe bank file.
+
+    Attributes:
+    - shoes (np.memmap): The read-only shoes of the file.
+    - dealt (int): The number of shoes handed out so far.
+    - stride (int): The step between two shoes of this reader.
+    - loop (bool): Whether to start over from ``offset`` once the end of the file is reached.
+    """
+
+    def __init__(self, path, offset=0, stride=1, loop=True):
+        """
+        Opens a shoe bank file.
+
+        Args:
+        - path (str): The file written by ``generate_shoe_bank``.
+        - offset (int): The index of the first shoe of this reader.
+        - stride (int): The step between two shoes of this reader.
+        - loop (bool): Whether to start over from ``offset`` once the end of the file is reached.
+        """
+        self.shoes = np.load(path, mmap_mode="r")
+        if self.shoes.dtype != np.uint8 or self.shoes.ndim != 2 or self.shoes.shape[1] % NUM_CODES:
+            raise ValueError(f"{path} is not a shoe bank")
+        if not 0 <= offset < len(self.shoes):
+            raise ValueError(f"Offset {offset} is outside of the {len(self.shoes)} shoes of {path}")
+        self.offset = offset
+        self.stride = stride
+        self.loop = loop
+        self.dealt = 0
+        # The number of shoes of this reader before it starts over
+        self.period = (len(self.shoes) - offset + stride - 1) // stride
+
+    @property
+    def index(self):
+        """
+        Returns the index of the next shoe in the file.
+        """
+        return self.offset + self.stride * (self.dealt % self.period)
+
+    @property
+    def num_decks(self):
+        return self.shoes.shape[1] // NUM_CODES
+
+    def __len__(self):
+        """
+        Returns the number of shoes in the file.
+        """
+        return len(self.shoes)
+
+    def next_shoe(self, out):
+        """
+        Copies the next shoe into a deck's buffer.
+
+        Args:
+        - out (np.ndarray): The uint8 buffer of the shoe, of the same size as the shoes of the file.
+
+        Returns:
+        - np.ndarray: out.
+        """
+        self._check(out)
+        self._take(1)
+        out[...] = self.shoes[self.offset + self.stride * ((self.dealt - 1) % self.period)]
+        return out
+
+    def next_shoes(self, out):
+        """
+        Copies the next ``len(out)`` shoes into a batch of buffers in one read.
+
+        Args:
+        - out (np.ndarray): The uint8 buffers of the shoes, shape (count, shoe size).
+
+        Returns:
+        - np.ndarray: out.
+        """
+        self._check(out)
+        start = self._take(len(out))
+        out[...] = self.shoes[self.offset + self.stride * (np.arange(start, self.dealt) % self.period)]
+        return out
+
+    def _check(self, out):
+        if out.shape[-1] != self.shoes.shape[1]:
+            raise ValueError(f"The shoe bank holds {self.num_decks}-deck shoes, not {out.shape[-1] // NUM_CODES}-deck shoes")
+
+    def _take(self, count):
+        """
+        Reserves the next ``count`` shoes and returns the number of shoes dealt before them.
+        """
+        if not self.loop and self.dealt + count > self.period:
+            raise IndexError("The shoe bank is exhausted")
+        start = self.dealt
+        self.dealt += count
+        return start
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Pre-generates shuffled shoes into a .npy shoe bank.")
+    parser.add_argument("path")
+    parser.add_argument("count", type=int)
+    parser.add_argument("--num-decks", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=None)
+    arguments = parser.parse_args()
+    generate_shoe_bank(arguments.path, arguments.count, arguments.num_decks, arguments.seed)
@@ -0,0 +1,414 @@
+import functools
+
+import numpy as np
+
+from src.wikipedia_agent import Actions, NO_ACTION
+
+"""
+Basic strategy solver
+
+Approximates the expected value of every action of every player hand under the rules of ``BlackJackEnv``:
+the dealer draws to 17 and stands on every 17 (see ``BlackJackEnv.dealer_play``), the hole card is not
+checked for blackjack, every win pays 1:1, any two-card hand can be doubled, a pair can be split once
+(see ``Seat.split_hand``) and split hands can be doubled and hit, aces included.
+
+The results are an infinite-deck approximation, not the exact EVs of an 8-deck shoe: card probabilities are
+those of the full shoe and do not change as cards are dealt (which is only exact for the first card of a
+fresh shoe). The two hands of a split are valued as two independent hands, each betting one chip: the
+correlation through the common dealer hand does not change the expected value, but the environment's shared
+chip (doubling one split hand doubles the bet of both) is not modelled.
+
+``CompositionEngine`` answers the same questions for any remaining shoe composition (e.g. the counts behind
+the envV 2 and 3 probability features), with the dealer drawing without replacement. The player's draws
+and the split chip are approximated as in ``Solver``.
+"""
+
+# Index of every dealer outcome in a dealer distribution: final totals 17 to 21, then bust.
+DEALER_TOTALS = (17, 18, 19, 20, 21)
+DEALER_BUST = len(DEALER_TOTALS)
+
+# Reward of an illegal move, per hand, as returned by the environment.
+ILLEGAL_REWARD = -100
+
+CARD_VALUES = tuple(range(2, 12))  # 2, 3, ..., 10, A
+
+
+def shoe_probabilities(num_decks=8):
+    """
+    Returns the probability of drawing each card value (2, 3, ..., 10, A) from a full shoe.
+
+    Args:
+    - num_decks (int): The number of decks in the shoe.
+
+    Returns:
+    - np.ndarray: The 10 probabilities.
+    """
+    counts = np.array([4] * 8 + [16, 4], dtype=np.float64) * num_decks
+    return counts / counts.sum()
+
+
+def hand_value(hard_total, has_ace):
+    """
+    Returns the best total of a hand given its hard total and whether it holds an ace.
+    """
+    return hard_total + 10 if has_ace and hard_total + 10 <= 21 else hard_total
+
+
+def add_value(hard_total, has_ace, value):
+    """
+    Returns the hard total and ace flag of a hand after a card of the given value is added.
+    """
+    if value == 11:
+        return hard_total + 1, True
+    return hard_total + value, has_ace
+
+
+class Solver:
+    """
+    Infinite-deck approximation of the expected values of stand, hit, double and split for every hand, with
+    memoized dealer outcomes.
+
+    Hands are described like the observations of ``BlackJackEnv``: the player's total, whether it is soft,
+    the value of the paired cards if the hand can be split (0 otherwise), the dealer's upcard and whether
+    the hand has exactly two cards. EVs are in units of the initial bet. Every card is drawn with the fixed
+    ``probabilities`` and split hands are valued with a chip each, so the values are approximate (see the
+    module docstring).
+
+    Attributes:
+    - probabilities (tuple): The probability of drawing each card value (2, 3, ..., 10, A).
+    - ten_pair_fraction (float): The probability that two ten-valued cards have the same rank (and can be split).
+    """
+
+    def __init__(self, num_decks=8, probabilities=None):
+        """
+        Initializes the solver.
+
+        Args:
+        - num_decks (int): The number of decks of the shoe the card probabilities are taken from.
+        - probabilities (list): Optional card value probabilities (2, 3, ..., 10, A) used instead of a full shoe.
+        """
+        if probabilities is None:
+            probabilities = shoe_probabilities(num_decks)
+        self.probabilities = tuple(float(p) for p in probabilities)
+        self.ten_pair_fraction = 1 / 4  # Ten, Jack, Queen and King are equally likely
+        self._draws = tuple((value, p) for value, p in zip(CARD_VALUES, self.probabilities) if p > 0)
+
+        self.dealer_distribution = functools.lru_cache(maxsize=None)(self._dealer_distribution)
+        self.stand_ev = functools.lru_cache(maxsize=None)(self._stand_ev)
+        self.hit_ev = functools.lru_cache(maxsize=None)(self._hit_ev)
+        self.double_ev = functools.lru_cache(maxsize=None)(self._double_ev)
+        self.split_ev = functools.lru_cache(maxsize=None)(self._split_ev)
+        self._dealer_from = functools.lru_cache(maxsize=None)(self._dealer_from_state)
+
+    def _dealer_from_state(self, hard_total, has_ace):
+        value = hand_value(hard_total, has_ace)
+        distribution = np.zeros(DEALER_BUST + 1)
+        if value > 21:
+            distribution[DEALER_BUST] = 1
+        elif value >= 17:
+            distribution[value - 17] = 1
+        else:
+            for card_value, p in self._draws:
+                distribution += p * self._dealer_from(*add_value(hard_total, has_ace, card_value))
+        distribution.flags.writeable = False
+        return distribution
+
+    def _dealer_distribution(self, dealer_value):
+        """
+        Returns the distribution of the dealer's final total given the upcard.
+
+        Args:
+        - dealer_value (int): The value of the dealer's upcard (2 to 11).
+
+        Returns:
+        - np.ndarray: The probabilities of 17, 18, 19, 20, 21 and bust.
+        """
+        return self._dealer_from(*add_value(0, False, dealer_value))
+
+    def _stand_ev(self, player_value, dealer_value):
+        """
+        Returns the expected value of standing on a total against the dealer's upcard.
+        """
+        if player_value > 21:
+            return -1.0
+        distribution = self.dealer_distribution(dealer_value)
+        ev = distribution[DEALER_BUST]
+        for index, total in enumerate(DEALER_TOTALS):
+            if player_value > total:
+                ev += distribution[index]
+            elif player_value < total:
+                ev -= distribution[index]
+        return float(ev)
+
+    def _best_after_hit(self, hard_total, has_ace, dealer_value):
+        value = hand_value(hard_total, has_ace)
+        if value > 21:
+            return -1.0
+        return max(self.stand_ev(value, dealer_value), self.hit_ev(hard_total, has_ace, dealer_value))
+
+    def _hit_ev(self, hard_total, has_ace, dealer_value):
+        """
+        Returns the expected value of hitting, then playing the best of stand and hit.
+        """
+        return sum(p * self._best_after_hit(*add_value(hard_total, has_ace, card_value), dealer_value)
+                   for card_value, p in self._draws)
+
+    def _double_ev(self, hard_total, has_ace, dealer_value):
+        """
+        Returns the expected value of doubling (one card, twice the bet).
+        """
+        return 2 * sum(p * self.stand_ev(hand_value(*add_value(hard_total, has_ace, card_value)), dealer_value)
+                       for card_value, p in self._draws)
+
+    def _split_ev(self, pair_value, dealer_value):
+        """
+        Returns the expected value of splitting a pair: two hands that each get one card and cannot split again.
+        """
+        ev = 0.0
+        for card_value, p in self._draws:
+            hard_total, has_ace = add_value(*add_value(0, False, pair_value), card_value)
+            value = hand_value(hard_total, has_ace)
+            ev += p * max(self.stand_ev(value, dealer_value),
+                          self.hit_ev(hard_total, has_ace, dealer_value),
+                          self.double_ev(hard_total, has_ace, dealer_value))
+        return 2 * ev
+
+    def action_evs(self, player_value, soft, pair_value, dealer_value, can_double):
+        """
+        Returns the expected value of every action of a hand.
+
+        Args:
+        - player_value (int): The value of the player's hand.
+        - soft (bool): Whether the hand is soft.
+        - pair_value (int): The value of the paired cards if the hand can be split, 0 otherwise.
+        - dealer_value (int): The value of the dealer's upcard.
+        - can_double (bool): Whether the hand has exactly two cards.
+
+        Returns:
+        - np.ndarray: The EVs of stand, hit, double and split, NaN for the actions that are not allowed.
+        """
+        hard_total = player_value - 10 if soft else player_value
+        evs = np.full(4, np.nan)
+        evs[Actions.STAND] = self.stand_ev(player_value, dealer_value)
+        evs[Actions.HIT] = self.hit_ev(hard_total, bool(soft), dealer_value)
+        if can_double:
+            evs[Actions.DOUBLE] = self.double_ev(hard_total, bool(soft), dealer_value)
+        if pair_value:
+            evs[Actions.SPLIT] = self.split_ev(pair_value, dealer_value)
+        return evs
+
+    def ev_table(self):
+        """
+        Returns the expected value of every action of every hand.
+
+        The table is indexed by [player_value, soft, pair_value, dealer_value, can_double, action], like
+        ``WikipediaAgent.table`` with one more axis for the action. Hands that cannot occur are NaN.
+
+        Returns:
+        - np.ndarray: The float table of shape (32, 2, 12, 12, 2, 4).
+        """
+        table = np.full((32, 2, 12, 12, 2, 4), np.nan)
+        for dealer_value in CARD_VALUES:
+            for can_double in (0, 1):
+                for player_value in range(4, 22):
+                    table[player_value, 0, 0, dealer_value, can_double] = self.action_evs(player_value, False, 0, dealer_value, can_double)
+                for player_value in range(12, 22):
+                    table[player_value, 1, 0, dealer_value, can_double] = self.action_evs(player_value, True, 0, dealer_value, can_double)
+            for pair_value in CARD_VALUES:
+                if pair_value == 11:
+                    player_value, soft = 12, 1
+                else:
+                    player_value, soft = 2 * pair_value, 0
+                table[player_value, soft, pair_value, dealer_value, 1] = self.action_evs(player_value, soft, pair_value, dealer_value, True)
+        return table
+
+    def action_table(self):
+        """
+        Returns the optimal action of every hand, indexed like ``WikipediaAgent.table``.
+
+        Returns:
+        - np.ndarray: The int8 table of shape (32, 2, 12, 12, 2), ``NO_ACTION`` for hands that cannot occur.
+        """
+        evs = self.ev_table()
+        playable = ~np.isnan(evs).all(axis=-1)
+        actions = np.full(evs.shape[:-1], NO_ACTION, dtype=np.int8)
+        actions[playable] = np.nanargmax(evs[playable], axis=-1)
+        return actions
+
+    def round_ev(self, table=None):
+        """
+        Returns the expected value of a round played with an action table.
+
+        Args:
+        - table (np.ndarray): An action table indexed like ``WikipediaAgent.table``, e.g. a compiled or
+          distilled policy. Defaults to the optimal ``action_table``.
+
+        Returns:
+        - float: The expected reward of a round, in units of the initial bet.
+        """
+        if table is None:
+            table = self.action_table()
+        lookup = np.asarray(table).tolist()
+        draws = self._draws
+
+        @functools.lru_cache(maxsize=None)
+        def play(hard_total, has_ace, dealer_value, two_cards, pair_value):
+            value = hand_value(hard_total, has_ace)
+            if value > 21:
+                return -1.0
+            soft = int(has_ace and hard_total + 10 <= 21)
+            action = lookup[value][soft][pair_value][dealer_value][int(two_cards)]
+            if action == Actions.STAND:
+                return self.stand_ev(value, dealer_value)
+            if action == Actions.HIT:
+                return sum(p * play(*add_value(hard_total, has_ace, card_value), dealer_value, False, 0)
+                           for card_value, p in draws)
+            if action == Actions.DOUBLE:
+                return self.double_ev(hard_total, has_ace, dealer_value) if two_cards else ILLEGAL_REWARD
+            if action == Actions.SPLIT:
+                if not pair_value:
+                    return ILLEGAL_REWARD
+                single = add_value(0, False, pair_value)
+                return 2 * sum(p * play(*add_value(*single, card_value), dealer_value, True, 0) for card_value, p in draws)
+            raise ValueError(f"Action table has no valid action for {value} {'soft' if soft else 'hard'} "
+                             f"against {dealer_value}: {action}")
+
+        ev = 0.0
+        for dealer_value, p_dealer in draws:
+            for first, p_first in draws:
+                for second, p_second in draws:
+                    hand = add_value(*add_value(0, False, first), second)
+                    p = p_dealer * p_first * p_second
+                    if first != second:
+                        ev += p * play(*hand, dealer_value, True, 0)
+                        continue
+                    pair_fraction = self.ten_pair_fraction if first == 10 else 1.0
+                    ev += p * pair_fraction * play(*hand, dealer_value, True, first)
+                    if pair_fraction < 1:
+                        ev += p * (1 - pair_fraction) * play(*hand, dealer_value, True, 0)
+        return ev
+
+
+class CompositionSolver(Solver):
+    """
+    Solver for a given shoe composition, with the dealer drawing without replacement.
+
+    The dealer's outcome distribution is computed without replacement from the composition (every card the
+    dealer draws is removed before the next one), while the player's draws keep the probabilities of the
+    composition, so the EVs are still approximate.
+
+    Attributes:
+    - remaining_counts (tuple): The number of unseen cards of each value (2, 3, ..., 10, A).
+    """
+
+    def __init__(self, remaining_counts):
+        """
+        Initializes the solver for a composition.
+
+        Args:
+        - remaining_counts (list): The number of unseen cards of each value (2, 3, ..., 10, A), as in
+          ``Deck.remaining_counts``: without the player's cards and the dealer's upcard.
+        """
+        self.remaining_counts = tuple(int(count) for count in remaining_counts)
+        self.remaining_total = sum(self.remaining_counts)
+        if self.remaining_total <= 0:
+            raise ValueError("The composition must contain at least one card")
+        super().__init__(probabilities=[count / self.remaining_total for count in self.remaining_counts])
+        self._dealer_after = functools.lru_cache(maxsize=None)(self._dealer_after_draws)
+
+    def _dealer_after_draws(self, hard_total, has_ace, drawn):
+        value = hand_value(hard_total, has_ace)
+        distribution = np.zeros(DEALER_BUST + 1)
+        if value > 21:
+            distribution[DEALER_BUST] = 1
+        elif value >= 17:
+            distribution[value - 17] = 1
+        else:
+            total = self.remaining_total - sum(drawn)
+            for index, count in enumerate(self.remaining_counts):
+                count -= drawn[index]
+                if count <= 0:
+                    continue
+                after = drawn[:index] + (drawn[index] + 1,) + drawn[index + 1:]
+                distribution += count / total * self._dealer_after(*add_value(hard_total, has_ace, CARD_VALUES[index]), after)
+        distribution.flags.writeable = False
+        return distribution
+
+    def _dealer_distribution(self, dealer_value):
+        return self._dealer_after(*add_value(0, False, dealer_value), (0,) * len(CARD_VALUES))
+
+
+class CompositionEngine:
+    """
+    Per-action EVs for any shoe composition, with a bounded LRU cache of solved compositions.
+
+    Compositions are quantized before the lookup: every count is rounded to a multiple of ``quantum``, so
+    nearby compositions share one solver. ``quantum=1`` keeps them exact.
+
+    Attributes:
+    - quantum (int): The step the remaining counts are rounded to.
+    - cache_size (int): The number of solved compositions kept in the cache.
+    """
+
+    def __init__(self, quantum=1, cache_size=1024):
+        """
+        Initializes the engine.
+
+        Args:
+        - quantum (int): The step the remaining counts are rounded to.
+        - cache_size (int): The number of solved compositions kept in the cache.
+        """
+        self.quantum = quantum
+        self.cache_size = cache_size
+        self.solver_for = functools.lru_cache(maxsize=cache_size)(self._solver_for)
+
+    def _solver_for(self, key):
+        """
+        Returns the solver of a quantized composition.
+        """
+        return CompositionSolver([count * self.quantum for count in key])
+
+    def quantize(self, remaining_counts):
+        """
+        Returns the cache key of a composition.
+        """
+        return tuple(int(round(count / self.quantum)) for count in remaining_counts)
+
+    def action_evs(self, remaining_counts, player_value, soft, pair_value, dealer_value, can_double):
+        """
+        Returns the expected value of every action of a hand for a shoe composition.
+
+        Args:
+        - remaining_counts (list): The number of unseen cards of each value (2, 3, ..., 10, A).
+        - player_value (int): The value of the player's hand.
+        - soft (bool): Whether the hand is soft.
+        - pair_value (int): The value of the paired cards if the hand can be split, 0 otherwise.
+        - dealer_value (int): The value of the dealer's upcard.
+        - can_double (bool): Whether the hand has exactly two cards.
+
+        Returns:
+        - np.ndarray: The EVs of stand, hit, double and split, NaN for the actions that are not allowed.
+        """
+        solver = self.solver_for(self.quantize(remaining_counts))
+        return solver.action_evs(player_value, soft, pair_value, dealer_value, can_double)
+
+    def env_action_evs(self, env):
+        """
+        Returns the expected value of every action of the hand being played in a ``BlackJackEnv``.
+
+        Args:
+        - env (BlackJackEnv): The environment, in the middle of a round.
+
+        Returns:
+        - np.ndarray: The EVs of stand, hit, double and split, NaN for the actions that are not allowed.
+        """
+        hand = env.playingHand
+        pair_value = hand.cards[0].value if hand.can_split() else 0
+        return self.action_evs(env.deck.remaining_counts, hand.value, hand.soft, pair_value,
+                               env.dealer_hand.cards[0].value, hand.can_double())
+
+    def best_action(self, *args, **kwargs):
+        """
+        Returns the action with the highest expected value, see ``action_evs`` for the arguments.
+        """
+        return int(np.nanargmax(self.action_evs(*args, **kwargs)))
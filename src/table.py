@@ -7,6 +7,9 @@ class Table:
 
     Attributes:
     - seats (list): A list of Seat objects representing the seats at the table.
+    - active_seat (int): The index of the seat holding the hand being played.
+    - active_hand (int): The index of the hand being played within the active seat.
+    - unresolved_hands (int): The number of hands whose outcome is still unclear (not busted).
     """
 
     def __init__(self):
@@ -14,6 +17,9 @@ class Table:
         Initializes a blackjack table with no seats.
         """
         self.seats: list[Seat] = []
+        self.active_seat = 0
+        self.active_hand = 0
+        self.unresolved_hands = 0
 
 
     def add_seat(self, seat):
@@ -25,9 +31,44 @@ class Table:
         """
         if len(self.seats) < 7:
             self.seats.append(seat)
+            self.unresolved_hands += len(seat.hands)
         else:
             print("The table is full. Cannot add more seats.")
 
+    def reset(self, chip_amounts):
+        """
+        Clears every seat in place for a new round.
+
+        Args:
+        - chip_amounts (list): The chip amount of each seat.
+        """
+        for seat, chip_amount in zip(self.seats, chip_amounts):
+            seat.reset(chip_amount)
+        self.active_seat = 0
+        self.active_hand = 0
+        self.unresolved_hands = len(self.seats)
+
+    def next_hand(self):
+        """
+        Returns the first hand that is not done, together with its seat.
+
+        Hands are played in order and never reopened, so the active position only moves forward and
+        each call is constant time (amortized).
+
+        Returns:
+        - tuple: The hand and its seat, or None if every hand is done.
+        """
+        while self.active_seat < len(self.seats):
+            seat = self.seats[self.active_seat]
+            while self.active_hand < len(seat.hands):
+                hand = seat.hands[self.active_hand]
+                if not hand.done:
+                    return hand, seat
+                self.active_hand += 1
+            self.active_seat += 1
+            self.active_hand = 0
+        return None
+
     def len_hands(self):
         """
         Returns the number of hands at the table.
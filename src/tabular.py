@@ -0,0 +1,300 @@
+import numpy as np
+
+from src.hand import Hand
+from src.seeding import make_rng
+from src.vector_environment import BlackJackVectorEnv
+
+"""
+Tabular reinforcement learning
+
+The envV=1 observation (player_sum, dealer_card, usable_ace, can_split, can_double) takes 3072 values, so
+its action values fit in a (3072, 4) NumPy array. ``TabularLearner`` fills that array with every-visit Monte
+Carlo control or Q-learning. It plays an epsilon-greedy policy on every table of a ``BlackJackVectorEnv``
+and applies the updates of a whole batch of tables at once. Illegal doubles and splits are never explored.
+The greedy policy is exported as a ``TabularPolicy`` lookup table, which needs neither torch nor SB3.
+
+    python -m src.tabular --method q_learning --steps 3000 --output policy.npy
+"""
+
+# player_sum, dealer_card, usable_ace, can_split, can_double
+STATE_SHAPE = (32, 12, 2, 2, 2)
+NUM_STATES = int(np.prod(STATE_SHAPE))
+ACTION_COUNT = 4
+
+
+def state_index(obs):
+    """
+    Returns the dense index of envV=1 observations.
+
+    Args:
+    - obs (dict): A Dict observation, with scalar or array fields.
+
+    Returns:
+    - int or np.ndarray: The state index in [0, NUM_STATES).
+    """
+    player_sum = np.asarray(obs["player_sum"], dtype=np.intp)
+    dealer_card = np.asarray(obs["dealer_card"], dtype=np.intp)
+    return (((player_sum * 12 + dealer_card) * 2 + np.asarray(obs["usable_ace"], dtype=np.intp)) * 2
+            + np.asarray(obs["can_split"], dtype=np.intp)) * 2 + np.asarray(obs["can_double"], dtype=np.intp)
+
+
+def legal_actions():
+    """
+    Returns the legal actions of every state.
+
+    Returns:
+    - np.ndarray: Boolean mask of stand, hit, double and split, shape (NUM_STATES, 4).
+    """
+    can_split, can_double = np.unravel_index(np.arange(NUM_STATES), STATE_SHAPE)[3:]
+    legal = np.ones((NUM_STATES, ACTION_COUNT), dtype=bool)
+    legal[:, 2] = can_double == 1
+    legal[:, 3] = can_split == 1
+    return legal
+
+
+class TabularPolicy:
+    """
+    Deterministic policy stored as one action per envV=1 state.
+
+    Attributes:
+    - table (np.ndarray): The int8 actions, indexed by [player_sum, dealer_card, usable_ace, can_split, can_double].
+    """
+
+    def __init__(self, table):
+        """
+        Initializes the policy from its table.
+
+        Args:
+        - table (np.ndarray): The actions, shape ``STATE_SHAPE``.
+        """
+        self.table = np.asarray(table, dtype=np.int8).reshape(STATE_SHAPE)
+        self._flat = self.table.ravel()
+        # Nested lists are faster than NumPy indexing for one hand at a time
+        self._lookup = self.table.tolist()
+
+    def get_action(self, dealer_hand: Hand, player_hand: Hand):
+        """
+        Returns the action of the policy for the hand being played in a ``BlackJackEnv``.
+
+        Args:
+        - dealer_hand (Hand): The dealer's hand.
+        - player_hand (Hand): The player's hand.
+
+        Returns:
+        - int: The action.
+        """
+        return self._lookup[player_hand.value][dealer_hand.cards[0].value][player_hand.soft][player_hand.can_split()][
+            len(player_hand.cards) == 2]
+
+    def get_actions(self, batch_obs):
+        """
+        Returns the actions of the policy for a batch of Dict observations, e.g. from ``BlackJackVectorEnv``.
+
+        Args:
+        - batch_obs (dict): Dict observations with array fields.
+
+        Returns:
+        - np.ndarray: The actions.
+        """
+        return self._flat[state_index(batch_obs)]
+
+    def predict(self, observation, state=None, episode_start=None, deterministic=True):
+        """
+        Returns the actions of a single or batched Dict observation, with the signature of SB3's ``predict``.
+
+        Returns:
+        - tuple: The action (or array of actions) and ``state``.
+        """
+        return self.get_actions(observation), state
+
+    def save_table(self, path):
+        """
+        Writes the table to a ``.npy`` file.
+        """
+        np.save(path, self.table)
+
+    @classmethod
+    def load_table(cls, path):
+        """
+        Reads a policy written by ``save_table``.
+        """
+        return cls(np.load(path))
+
+
+class TabularLearner:
+    """
+    Learns the action values of the envV=1 states on a vector environment.
+
+    Attributes:
+    - method (str): "monte_carlo" (every-visit Monte Carlo control) or "q_learning".
+    - q (np.ndarray): The action values, shape (NUM_STATES, 4). Illegal actions stay at 0 and are never chosen.
+    - visits (np.ndarray): The number of updates of every action value.
+    - alpha (float): The step size, or None to average the returns (step size 1 / visits).
+    - gamma (float): The discount factor of Q-learning targets.
+    - env (BlackJackVectorEnv): The tables played on.
+    - steps (int): The number of environment steps played so far (one per table and step).
+    """
+
+    def __init__(self, method="monte_carlo", num_envs=1024, alpha=None, gamma=1.0, seed=None, env_kwargs=None):
+        """
+        Initializes empty action values and the vector environment.
+
+        Args:
+        - method (str): "monte_carlo" or "q_learning".
+        - num_envs (int): The number of tables played in lockstep.
+        - alpha (float): Optional constant step size; by default the values are sample averages.
+        - gamma (float): The discount factor of Q-learning targets.
+        - seed: Optional seed (see ``src.seeding.make_rng``) of the shoes and of the exploration.
+        - env_kwargs (dict): Optional extra arguments of the ``BlackJackVectorEnv``.
+        """
+        if method not in ("monte_carlo", "q_learning"):
+            raise ValueError(f"Unknown method: {method}")
+        self.method = method
+        self.alpha = alpha
+        self.gamma = gamma
+        self.rng = make_rng(seed)
+        self.q = np.zeros((NUM_STATES, ACTION_COUNT), dtype=np.float64)
+        self.visits = np.zeros((NUM_STATES, ACTION_COUNT), dtype=np.int64)
+        self.legal = legal_actions()
+        self.env = BlackJackVectorEnv(num_envs=num_envs, envV=1, seed=self.rng, final_observation=False,
+                                      **(env_kwargs or {}))
+        self.steps = 0
+        # The (state, action) pairs visited by every table in its current round, -1 past the end.
+        self._episodes = np.full((num_envs, 32), -1, dtype=np.int64)
+        self._lengths = np.zeros(num_envs, dtype=np.int64)
+        self._obs = None
+
+    def act(self, states, epsilon):
+        """
+        Returns epsilon-greedy actions among the legal actions of the given states.
+
+        Args:
+        - states (np.ndarray): The state indices.
+        - epsilon (float): The probability of a uniformly random legal action.
+
+        Returns:
+        - np.ndarray: The actions.
+        """
+        legal = self.legal[states]
+        actions = np.where(legal, self.q[states], -np.inf).argmax(axis=1)
+        explore = self.rng.random(len(states)) < epsilon
+        if explore.any():
+            # The largest of uniform draws on the legal actions only is a uniformly random legal action.
+            actions[explore] = (self.rng.random((int(explore.sum()), ACTION_COUNT)) * legal[explore]).argmax(axis=1)
+        return actions
+
+    def train(self, steps, epsilon=0.1, final_epsilon=None):
+        """
+        Plays ``steps`` steps of the vector environment and updates the action values.
+
+        Args:
+        - steps (int): The number of vector steps (each one plays one action on every table).
+        - epsilon (float): The exploration rate at the start.
+        - final_epsilon (float): Optional exploration rate at the end, reached by linear decay.
+
+        Returns:
+        - TabularLearner: self.
+        """
+        if self._obs is None:
+            self._obs, _ = self.env.reset()
+        states = state_index(self._obs)
+        final_epsilon = epsilon if final_epsilon is None else final_epsilon
+        for step in range(steps):
+            actions = self.act(states, epsilon + (final_epsilon - epsilon) * step / max(steps - 1, 1))
+            self._obs, rewards, terminated, truncated, _ = self.env.step(actions)
+            next_states = state_index(self._obs)
+            ended = terminated | truncated
+            pairs = states * ACTION_COUNT + actions
+            if self.method == "q_learning":
+                self._q_learning_update(pairs, rewards, ended, next_states)
+            else:
+                self._monte_carlo_update(pairs, rewards, ended)
+            states = next_states
+        self.steps += steps * self.env.num_envs
+        return self
+
+    def _q_learning_update(self, pairs, rewards, ended, next_states):
+        """
+        Moves the values of the played pairs towards ``reward + gamma * max Q(next state)``.
+
+        The observation after the end of a round belongs to the next round, so finished rounds are not bootstrapped.
+        """
+        next_values = np.where(self.legal[next_states], self.q[next_states], -np.inf).max(axis=1)
+        targets = rewards + self.gamma * np.where(ended, 0.0, next_values)
+        self._update(pairs, targets - self.q.ravel()[pairs])
+
+    def _monte_carlo_update(self, pairs, rewards, ended):
+        """
+        Records the played pairs and, once a round ends, moves all of them towards the round's reward.
+        """
+        rows = self.env._rows
+        self._episodes[rows, self._lengths] = pairs
+        self._lengths += 1
+        if ended.any():
+            episodes = self._episodes[ended]
+            visited = episodes >= 0
+            returns = np.broadcast_to(rewards[ended][:, None], episodes.shape)[visited]
+            visited_pairs = episodes[visited]
+            self._update(visited_pairs, returns - self.q.ravel()[visited_pairs])
+            self._episodes[ended] = -1
+            self._lengths[ended] = 0
+
+    def _update(self, pairs, errors):
+        """
+        Applies a batch of updates; errors of the same pair are summed before the step size is applied.
+        """
+        counts = np.bincount(pairs, minlength=NUM_STATES * ACTION_COUNT)
+        sums = np.bincount(pairs, weights=errors, minlength=NUM_STATES * ACTION_COUNT)
+        visits = self.visits.ravel()
+        visits += counts
+        q = self.q.ravel()
+        if self.alpha is None:
+            np.divide(sums, visits, out=sums, where=visits > 0)
+            q += sums
+        else:
+            np.divide(sums, counts, out=sums, where=counts > 0)
+            q += self.alpha * sums
+
+    def greedy_actions(self):
+        """
+        Returns the best legal action of every state.
+
+        Returns:
+        - np.ndarray: The actions, shape (NUM_STATES,).
+        """
+        return np.where(self.legal, self.q, -np.inf).argmax(axis=1)
+
+    def policy(self):
+        """
+        Returns the greedy policy as a lookup table.
+
+        Returns:
+        - TabularPolicy: The policy.
+        """
+        return TabularPolicy(self.greedy_actions().reshape(STATE_SHAPE))
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    from src.evaluation import evaluate
+
+    parser = argparse.ArgumentParser(description="Trains a tabular policy on the envV=1 states.")
+    parser.add_argument("--method", choices=["monte_carlo", "q_learning"], default="monte_carlo")
+    parser.add_argument("--steps", type=int, default=3000, help="Vector steps, each one plays every table once.")
+    parser.add_argument("--num-envs", type=int, default=1024)
+    parser.add_argument("--epsilon", type=float, default=0.2)
+    parser.add_argument("--final-epsilon", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", default=None, help="Optional .npy file the policy table is written to.")
+    arguments = parser.parse_args()
+
+    start = time.perf_counter()
+    learner = TabularLearner(arguments.method, num_envs=arguments.num_envs, seed=arguments.seed)
+    learner.train(arguments.steps, arguments.epsilon, arguments.final_epsilon)
+    print(f"{learner.steps} steps in {time.perf_counter() - start:.1f}s")
+    policy = learner.policy()
+    if arguments.output:
+        policy.save_table(arguments.output)
+    print(evaluate(policy, 1_000_000, seed=arguments.seed))
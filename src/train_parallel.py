@@ -0,0 +1,233 @@
+import multiprocessing
+import os
+from datetime import datetime
+
+import gymnasium as gym
+import numpy as np
+from gymnasium.vector import AsyncVectorEnv
+from stable_baselines3 import PPO
+from stable_baselines3.common.vec_env import VecEnv, VecMonitor, SubprocVecEnv, DummyVecEnv
+
+from src.callbacks.episodeStats import EpisodeStatsCallback
+from src.environment import ENV_ID
+from src.seeding import spawn_int_seeds
+
+"""
+Parallel PPO training
+
+Runs ``n_envs`` copies of the registered ``BlackJackEnv-v0`` in worker processes and trains PPO on them:
+
+- "shared" (default): a gymnasium ``AsyncVectorEnv`` whose workers write their observations into shared
+  memory, adapted to SB3's ``VecEnv`` interface by ``SharedMemoryVecEnv``.
+- "subproc": SB3's ``SubprocVecEnv``, which sends the observations through pipes.
+- "dummy": every environment in the main process, for debugging.
+
+Every worker is seeded with its own ``SeedSequence`` child of ``--seed``, so the workers never share shoes.
+Episodes of all workers are recorded by one ``VecMonitor``, and ``EpisodeStatsCallback`` logs the summed
+game counters (win, loss and draw rates, money, illegal moves).
+
+    python -m src.train_parallel --envV 1 --n-envs 32 --n-steps 256 --total-timesteps 10000000
+"""
+
+# The gymnasium release SharedMemoryVecEnv is written against, pinned in requirements.txt.
+GYMNASIUM_VERSION = "0.29."
+
+
+def make_env(seed, env_kwargs=None):
+    """
+    Returns a function creating a seeded ``BlackJackEnv-v0`` (picklable, for worker processes).
+
+    Args:
+    - seed (int): The seed of the environment's first reset.
+    - env_kwargs (dict): Optional arguments of the environment.
+    """
+    env_kwargs = dict(env_kwargs or {})
+
+    def create():
+        # The module prefix imports src.environment, which registers the environment in fresh worker processes.
+        env = gym.make(f"src.environment:{ENV_ID}", **env_kwargs)
+        # Later resets without a seed keep drawing from the generators seeded here.
+        env.reset(seed=seed)
+        return env
+
+    return create
+
+
+class SharedMemoryVecEnv(VecEnv):
+    """
+    SB3 ``VecEnv`` running a gymnasium ``AsyncVectorEnv`` with shared-memory observations.
+
+    Gymnasium returns the infos of a step as a dict of per-environment arrays and keeps the last observation
+    of finished episodes in ``final_observation``; they are converted to SB3's list of info dicts with
+    ``terminal_observation``.
+    """
+
+    def __init__(self, env_fns, start_method=None):
+        """
+        Starts one worker process per environment.
+
+        Args:
+        - env_fns (list): Functions creating the environments.
+        - start_method (str): The multiprocessing start method, "forkserver" by default.
+        """
+        if not gym.__version__.startswith(GYMNASIUM_VERSION):
+            # The worker commands sent by _send and the final_observation infos are gymnasium 0.29 internals.
+            raise RuntimeError(f"SharedMemoryVecEnv needs gymnasium {GYMNASIUM_VERSION}x (see requirements.txt), "
+                               f"not {gym.__version__}; use the \"subproc\" backend")
+        if start_method is None:
+            # Same default as SubprocVecEnv: forking a process that already runs torch is not safe.
+            start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        try:
+            self.envs = AsyncVectorEnv(env_fns, shared_memory=True, context=start_method)
+        except TypeError as error:
+            # Shared memory is built from ctypes arrays, which have no float16 type (the envV=3 "prob" box).
+            raise ValueError("The observation space cannot be put in shared memory, "
+                             "use obs_mode=\"flat\" or the \"subproc\" backend") from error
+        super().__init__(len(env_fns), self.envs.single_observation_space, self.envs.single_action_space)
+
+    def reset(self):
+        seeds = None if all(seed is None for seed in self._seeds) else self._seeds
+        obs, infos = self.envs.reset(seed=seeds)
+        self.reset_infos = self._list_infos(infos)
+        self._seeds = [None] * self.num_envs
+        return obs
+
+    def step_async(self, actions):
+        self.envs.step_async(np.asarray(actions))
+
+    def step_wait(self):
+        obs, rewards, terminated, truncated, infos = self.envs.step_wait()
+        dones = terminated | truncated
+        list_infos = self._list_infos(infos)
+        for index in np.flatnonzero(dones):
+            info = dict(infos["final_info"][index] or {})
+            info["terminal_observation"] = infos["final_observation"][index]
+            info["TimeLimit.truncated"] = bool(truncated[index] and not terminated[index])
+            list_infos[index] = info
+        return obs, rewards, dones, list_infos
+
+    def _list_infos(self, infos):
+        """
+        Splits gymnasium vector infos into one dict per environment.
+        """
+        list_infos = [{} for _ in range(self.num_envs)]
+        for key, values in infos.items():
+            if key.startswith("_") or key in ("final_observation", "final_info"):
+                continue
+            for index in np.flatnonzero(infos.get("_" + key, np.ones(self.num_envs, dtype=bool))):
+                list_infos[index][key] = values[index]
+        return list_infos
+
+    def close(self):
+        self.envs.close()
+
+    def _indices(self, indices):
+        if indices is None:
+            return range(self.num_envs)
+        return [indices] if isinstance(indices, int) else indices
+
+    def _send(self, indices, command, data):
+        """
+        Sends a command to the selected workers only and returns their answers.
+
+        ``AsyncVectorEnv.call`` and ``set_attr`` always address every worker, so the worker pipes are used directly.
+        This relies on private members of ``AsyncVectorEnv``, which is why the constructor checks the gymnasium
+        version; ``src/train_parallel_test.py`` exercises it.
+        """
+        envs = self.envs
+        envs._assert_is_running()
+        if envs._state.value != "default":
+            raise RuntimeError(f"Cannot send `{command}` while waiting for a pending call to `{envs._state.value}`")
+        indices = list(self._indices(indices))
+        for index in indices:
+            envs.parent_pipes[index].send((command, data))
+        results, successes = zip(*[envs.parent_pipes[index].recv() for index in indices]) if indices else ((), ())
+        # The error count of _raise_if_errors is taken over every worker, the others succeed trivially.
+        envs._raise_if_errors(list(successes) + [True] * (self.num_envs - len(indices)))
+        return list(results)
+
+    def get_attr(self, attr_name, indices=None):
+        # A "_call" of an attribute that is not callable returns its value.
+        return self._send(indices, "_call", (attr_name, (), {}))
+
+    def set_attr(self, attr_name, value, indices=None):
+        self._send(indices, "_setattr", (attr_name, value))
+
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        return self._send(indices, "_call", (method_name, method_args, method_kwargs))
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        # The registered environment is created without wrappers.
+        return [False for _ in self._indices(indices)]
+
+
+def make_training_env(n_envs, seed=None, env_kwargs=None, backend="shared", log_dir=None):
+    """
+    Builds the vectorized training environment.
+
+    Args:
+    - n_envs (int): The number of environments, one worker process each (except for "dummy").
+    - seed (int): Optional parent seed of the per-worker seeds.
+    - env_kwargs (dict): Optional arguments of every ``BlackJackEnv``.
+    - backend (str): "shared", "subproc" or "dummy".
+    - log_dir (str): Optional folder of the ``VecMonitor`` episode log.
+
+    Returns:
+    - VecMonitor: The environment, recording the episodes of every worker.
+    """
+    env_kwargs = {"render_mode": None, **(env_kwargs or {})}
+    env_fns = [make_env(worker_seed, env_kwargs) for worker_seed in spawn_int_seeds(seed, n_envs)]
+    if backend == "shared":
+        vec_env = SharedMemoryVecEnv(env_fns)
+    elif backend == "subproc":
+        vec_env = SubprocVecEnv(env_fns)
+    elif backend == "dummy":
+        vec_env = DummyVecEnv(env_fns)
+    else:
+        raise ValueError(f"Unknown backend: {backend}")
+    if log_dir is not None:
+        os.makedirs(log_dir, exist_ok=True)
+    return VecMonitor(vec_env, log_dir)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from config import CHECKPOINT_DIR, LOG_DIR
+    from stable_baselines3.common.utils import set_random_seed
+
+    from src.callbacks.trainAndLogging import TrainAndLoggingCallback
+
+    parser = argparse.ArgumentParser(description="Trains PPO on BlackJackEnv workers in parallel.")
+    parser.add_argument("--envV", type=int, default=1)
+    parser.add_argument("--obs-mode", choices=["dict", "flat"], default="dict")
+    parser.add_argument("--illegal-action-mode", choices=["terminate", "mask"], default="terminate")
+    parser.add_argument("--n-envs", type=int, default=os.cpu_count())
+    parser.add_argument("--n-steps", type=int, default=256, help="Steps collected by every worker per update.")
+    parser.add_argument("--batch-size", type=int, default=512)
+    parser.add_argument("--total-timesteps", type=int, default=10_000_000)
+    parser.add_argument("--backend", choices=["shared", "subproc", "dummy"], default="shared")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", default=None, help="The zip file the model is saved to.")
+    arguments = parser.parse_args()
+
+    env = make_training_env(arguments.n_envs, arguments.seed, {
+        "envV": arguments.envV,
+        "obs_mode": arguments.obs_mode,
+        "illegal_action_mode": arguments.illegal_action_mode,
+    }, arguments.backend, LOG_DIR)
+    policy = "MultiInputPolicy" if arguments.obs_mode == "dict" else "MlpPolicy"
+    if arguments.seed is not None:
+        # Seeds torch, NumPy and random only: PPO(seed=...) would also call env.seed(seed), which reseeds the
+        # workers with seed + index on the next reset and replaces their SeedSequence children.
+        set_random_seed(arguments.seed)
+    model = PPO(policy, env, n_steps=arguments.n_steps, batch_size=arguments.batch_size,
+                tensorboard_log=LOG_DIR, verbose=1)
+    callbacks = [
+        EpisodeStatsCallback(log_freq=max(1, 10_000 // arguments.n_envs)),
+        TrainAndLoggingCallback(check_freq=max(1, 1_000_000 // arguments.n_envs), save_path=CHECKPOINT_DIR),
+    ]
+    model.learn(total_timesteps=arguments.total_timesteps, callback=callbacks,
+                tb_log_name=datetime.now().strftime("%Y-%m-%d_%H-%M-%S"))
+    model.save(arguments.output or f"src/models/PPO_{arguments.total_timesteps}_env{arguments.envV}_parallel.zip")
+    env.close()
@@ -0,0 +1,35 @@
+import numpy as np
+
+from src.train_parallel import SharedMemoryVecEnv, make_env
+from src.seeding import spawn_int_seeds
+
+"""
+Checks that ``SharedMemoryVecEnv`` only reads, writes and calls the workers selected by ``indices``. It drives
+private members of gymnasium's ``AsyncVectorEnv``, so run this after changing the gymnasium version.
+
+    python -m src.train_parallel_test
+"""
+
+if __name__ == "__main__":
+    env = SharedMemoryVecEnv([make_env(seed, {"render_mode": None}) for seed in spawn_int_seeds(0, 3)])
+    env.reset()
+
+    env.set_attr("fps", 3, indices=1)
+    assert env.get_attr("fps") == [1, 3, 1], env.get_attr("fps")
+    assert env.get_attr("fps", indices=[2, 1]) == [1, 3]
+
+    env.env_method("__setattr__", "win", 7, indices=[0])
+    assert env.get_attr("win") == [7, 0, 0], env.get_attr("win")
+    assert len(env.env_method("action_masks", indices=2)) == 1
+
+    env.step(np.zeros(3, dtype=np.int64))
+    assert env.get_attr("played_hands") == [1, 1, 1], env.get_attr("played_hands")
+
+    try:
+        env.env_method("missing_method", indices=[1])
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("A worker error was not raised")
+    env.close()
+    print("SharedMemoryVecEnv addresses only the selected workers")
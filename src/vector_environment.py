@@ -0,0 +1,483 @@
+from typing import Any, Optional
+
+import numpy as np
+from gymnasium.vector import VectorEnv
+
+from src.card import NUM_CODES, NUM_SUITS, CODE_VALUES, CODE_IS_ACE, HI_LO
+from src.environment import make_spaces, PROB_KEYS
+from src.observation import FlatObservation
+from src.seeding import make_rng
+
+_CODE_VALUES = np.array(CODE_VALUES, dtype=np.int64)
+_CODE_IS_ACE = np.array(CODE_IS_ACE, dtype=np.int64)
+_HI_LO = np.array(HI_LO, dtype=np.int64)
+
+
+class BlackJackVectorEnv(VectorEnv):
+    """
+    A batch of Blackjack tables simulated in lockstep with NumPy.
+
+    Every table has exactly one seat: there is no ``seats_count``, so it only reproduces ``BlackJackEnv`` with
+    its default single seat. It follows the same rules: the dealer stands on 17, a hand can be split once,
+    both split hands share the seat's chip, illegal moves end the round with ``-100`` per hand (or are played
+    as hits with ``illegal_action_mode="mask"``), and the deck is reshuffled between rounds once less than 30%
+    of it remains.
+    Finished rounds are reset automatically. Unless ``final_observation=False``, ``info["final_observation"]``
+    holds a copy of the whole observation batch taken before the reset (a dict of arrays, or an array for
+    flat observations), and ``info["_final_observation"]`` marks the tables whose row is the last observation
+    of a finished round. The legal actions of every table are returned by ``action_masks`` and in
+    ``info["action_mask"]``.
+
+    The observations are written into preallocated buffers that are reused on every step, copy them if you
+    need to keep them.
+
+    Attributes:
+        - envV: The observation layout (1, 2 or 3), identical to ``BlackJackEnv``.
+        - win, loss, draw, played_hands, illegal_moves: Per-table counters.
+        - money, all_money: Per-table sum of rewards and of chips put on the table (in units of 100).
+        - shoe, cursor: The card codes of every table's shoe and the index of its next card.
+        - remaining_counts, remaining_total: The number of unseen cards of each rank and in total, per table.
+        - running_count: The Hi-Lo running count of the seen cards, per table.
+        - hard_total, ace_count, card_count, pair, done, busted, doubled: Per-hand state, shape (num_envs, 2).
+        - hand_count, active_hand, splitted, bet: Per-seat state.
+        - dealer_up, dealer_hole, dealer_hard, dealer_aces: Dealer state.
+    """
+
+    metadata = {"render_modes": [], "autoreset": True}
+
+    def __init__(self, num_envs=1, envV=1, chip_amount=100, num_decks=8, seed=None, final_observation=True,
+                 obs_mode="dict", one_hot=True, shoe_source=None, illegal_action_mode="terminate"):
+        """
+        Initializes the batch of tables.
+
+        Args:
+        - num_envs (int): The number of tables.
+        - envV (int): The observation layout (1, 2 or 3).
+        - chip_amount (int): The chip amount of every seat.
+        - num_decks (int): The number of decks in every shoe.
+        - seed: Optional seed of the random generator: an int, a SeedSequence (e.g. from ``spawn_seeds``) or a Generator.
+        - final_observation (bool): Whether to return a copy of the observations before the reset of finished rounds
+          in the info dict.
+        - obs_mode (str): "dict" for Dict observations, "flat" for a single float32 array of shape (num_envs, size).
+        - one_hot (bool): Whether the discrete fields of flat observations are one-hot encoded.
+        - shoe_source: Optional source of pre-shuffled shoes (e.g. a ``ShoeBank``) used instead of shuffling.
+        - illegal_action_mode (str): "terminate" ends the round with -100 per hand on an illegal double or split,
+          "mask" plays it as a hit instead.
+        """
+        if illegal_action_mode not in ("terminate", "mask"):
+            raise ValueError(f"Unknown illegal action mode: {illegal_action_mode}")
+        action_space, observation_space = make_spaces(envV)
+        self.flat_obs = None
+        if obs_mode == "flat":
+            self.flat_obs = FlatObservation(observation_space, one_hot=one_hot, batch_size=num_envs)
+            observation_space = self.flat_obs.space
+        elif obs_mode != "dict":
+            raise ValueError(f"Unknown observation mode: {obs_mode}")
+        super().__init__(num_envs, observation_space, action_space)
+        self.envV = envV
+        self.chip_amount = chip_amount
+        self.num_decks = num_decks
+        self.rng = make_rng(seed)
+        self.final_observation = final_observation
+        self.shoe_source = shoe_source
+        self.illegal_action_mode = illegal_action_mode
+
+        n = num_envs
+        self.shoe_size = NUM_CODES * num_decks
+        self.shoe = np.tile(np.arange(NUM_CODES, dtype=np.uint8), (n, num_decks))
+        self.cursor = np.zeros(n, dtype=np.int64)
+        self.full_counts = np.array([4] * 8 + [16, 4], dtype=np.int64) * num_decks
+        self.remaining_counts = np.tile(self.full_counts, (n, 1))
+        self.remaining_total = np.full(n, self.shoe_size, dtype=np.int64)
+        self.running_count = np.zeros(n, dtype=np.int64)
+        self.hole_pending = np.zeros(n, dtype=bool)
+        self._probabilities = np.zeros((n, 10), dtype=np.float64)
+        self.last_card = np.zeros(n, dtype=np.int64)
+        self.last_second_card = np.zeros(n, dtype=np.int64)
+        self.last_third_card = np.zeros(n, dtype=np.int64)
+
+        self.hard_total = np.zeros((n, 2), dtype=np.int64)
+        self.ace_count = np.zeros((n, 2), dtype=np.int64)
+        self.card_count = np.zeros((n, 2), dtype=np.int64)
+        self.first_rank = np.zeros((n, 2), dtype=np.int64)
+        self.pair = np.zeros((n, 2), dtype=bool)
+        self.done = np.zeros((n, 2), dtype=bool)
+        self.busted = np.zeros((n, 2), dtype=bool)
+        self.doubled = np.zeros((n, 2), dtype=bool)
+        self.hand_count = np.ones(n, dtype=np.int64)
+        self.active_hand = np.zeros(n, dtype=np.int64)
+        self.splitted = np.zeros(n, dtype=bool)
+        self.bet = np.zeros(n, dtype=np.float64)
+
+        self.dealer_up = np.zeros(n, dtype=np.int64)
+        self.dealer_hole = np.zeros(n, dtype=np.int64)
+        self.dealer_hard = np.zeros(n, dtype=np.int64)
+        self.dealer_aces = np.zeros(n, dtype=np.int64)
+
+        self.win = np.zeros(n, dtype=np.int64)
+        self.loss = np.zeros(n, dtype=np.int64)
+        self.draw = np.zeros(n, dtype=np.int64)
+        self.played_hands = np.zeros(n, dtype=np.int64)
+        self.illegal_moves = np.zeros(n, dtype=np.int64)
+        self.money = np.zeros(n, dtype=np.float64)
+        self.all_money = np.zeros(n, dtype=np.float64)
+
+        self._rows = np.arange(n)
+        self._rewards = np.zeros(n, dtype=np.float64)
+        self._terminated = np.zeros(n, dtype=bool)
+        self._truncated = np.zeros(n, dtype=bool)
+        self._actions = np.zeros(n, dtype=np.int64)
+        if self.flat_obs is None:
+            self._obs = {key: np.zeros(space.shape, dtype=space.dtype) for key, space in self.observation_space.spaces.items()}
+
+    @property
+    def cards_drawn_from_each(self):
+        """
+        Returns the number of seen cards drawn from each rank, shape (num_envs, 10).
+        """
+        return self.full_counts - self.remaining_counts
+
+    @property
+    def true_count(self):
+        """
+        Returns the Hi-Lo true count of every table: the running count per deck of unseen cards.
+        """
+        return self.running_count * 52 / self.remaining_total
+
+    @staticmethod
+    def hand_value(hard_total, ace_count):
+        """
+        Returns the best total of hands given their hard totals and ace counts (works on arrays).
+        """
+        return hard_total + 10 * ((ace_count > 0) & (hard_total + 10 <= 21))
+
+    def reset_wait(self, seed: Optional[int] = None, options: Optional[dict] = None):
+        """
+        Reshuffles every shoe and deals a new round on every table.
+        """
+        if seed is not None:
+            self.rng = make_rng(seed)
+            # Shuffling permutes the current shoes, so start from sorted ones to only depend on the seed.
+            self.shoe.sort(axis=1)
+        self._shuffle(self._rows)
+        self._start_round(self._rows)
+        return self._write_obs(), self._mask_infos()
+
+    def step_async(self, actions):
+        self._actions[:] = actions
+
+    def step_wait(self, **kwargs) -> tuple[Any, np.ndarray, np.ndarray, np.ndarray, dict[str, Any]]:
+        """
+        Applies one action on every table, finishes the rounds that are over and resets them.
+        """
+        actions = self._actions
+        rows = self._rows
+        active = self.active_hand
+        self._rewards.fill(0)
+        self._terminated.fill(False)
+
+        illegal = np.zeros(self.num_envs, dtype=bool)
+        if self.illegal_action_mode == "mask":
+            masks = self.action_masks()
+            masked = ~masks[rows, actions]
+            if masked.any():
+                self.illegal_moves[masked] += 1
+                actions[masked] = 1
+
+        stand = rows[actions == 0]
+        self.done[stand, active[stand]] = True
+
+        hit = rows[actions == 1]
+        if hit.size:
+            self._add_card(hit, active[hit], self._draw(hit))
+            self._check_bust(hit, active[hit])
+
+        double = rows[actions == 2]
+        if double.size:
+            legal = self.card_count[double, active[double]] == 2
+            illegal[double[~legal]] = True
+            double = double[legal]
+            hands = active[double]
+            self.doubled[double, hands] = True
+            self.bet[double] *= 2
+            self._add_card(double, hands, self._draw(double))
+            self.done[double, hands] = True
+            self._check_bust(double, hands)
+
+        split = rows[actions == 3]
+        if split.size:
+            legal = self.pair[split, 0] & ~self.splitted[split]
+            illegal[split[~legal]] = True
+            split = split[legal]
+            self.splitted[split] = True
+            self.hand_count[split] = 2
+            for column in (self.hard_total, self.ace_count):
+                column[split, :] = (column[split, 0] // 2)[:, None]
+            self.first_rank[split, 1] = self.first_rank[split, 0]
+            self.card_count[split, :] = 1
+            self.pair[split, :] = False
+            zeros = np.zeros(split.size, dtype=np.int64)
+            self._add_card(split, zeros, self._draw(split))
+            self._add_card(split, zeros + 1, self._draw(split))
+
+        if illegal.any():
+            self.illegal_moves[illegal] += 1
+            self._rewards[illegal] = self.hand_count[illegal] * -100
+            self._terminated[illegal] = True
+
+        # Move to the second hand of a split seat once the first one is finished.
+        advance = self.done[rows, active] & (active == 0) & (self.hand_count == 2) & ~self.done[:, 1] & ~illegal
+        active[advance] = 1
+
+        finished = rows[self.done[rows, active] & ~illegal]
+        if finished.size:
+            self._dealer_play(finished)
+            self._results(finished)
+            self._count_hole(finished)
+            self._terminated[finished] = True
+
+        obs = self._write_obs()
+        infos = {}
+        if self._terminated.any():
+            ended = rows[self._terminated]
+            if self.final_observation:
+                infos.update(self._final_infos(obs))
+
+            reshuffle = ended[(self.shoe_size - self.cursor[ended]) / self.shoe_size < 0.3]
+            if reshuffle.size:
+                self._shuffle(reshuffle)
+            self._start_round(ended)
+            obs = self._write_obs()
+
+        infos.update(self._mask_infos())
+        return obs, self._rewards.copy(), self._terminated.copy(), self._truncated.copy(), infos
+
+    def action_masks(self):
+        """
+        Returns the legal actions of every table's active hand.
+
+        Returns:
+        - np.ndarray: Boolean masks of stand, hit, double and split, shape (num_envs, 4).
+        """
+        rows = self._rows
+        active = self.active_hand
+        masks = np.ones((self.num_envs, 4), dtype=bool)
+        masks[:, 2] = self.card_count[rows, active] == 2
+        masks[:, 3] = self.pair[rows, active] & ~self.splitted
+        return masks
+
+    def _mask_infos(self):
+        """
+        Returns the info entries holding the legal actions of every table.
+        """
+        return {"action_mask": self.action_masks(), "_action_mask": np.ones(self.num_envs, dtype=bool)}
+
+    def _final_infos(self, obs):
+        """
+        Returns the info entries holding the last observation of the finished rounds.
+
+        The whole batch is copied at once, the rows of the tables that are still playing are masked out by
+        ``_final_observation``.
+        """
+        if self.flat_obs is None:
+            final_observation = {key: value.copy() for key, value in obs.items()}
+        else:
+            final_observation = obs.copy()
+        return {"final_observation": final_observation, "_final_observation": self._terminated.copy()}
+
+    def _shuffle(self, rows):
+        """
+        Collects and reshuffles the shoes of the given tables.
+        """
+        if self.shoe_source is not None:
+            self.shoe[rows] = self.shoe_source.next_shoes(np.empty((len(rows), self.shoe_size), dtype=np.uint8))
+        else:
+            self.shoe[rows] = self.rng.permuted(self.shoe[rows], axis=1)
+        self.cursor[rows] = 0
+        self.remaining_counts[rows] = self.full_counts
+        self.remaining_total[rows] = self.shoe_size
+        self.running_count[rows] = 0
+        self.hole_pending[rows] = False
+
+    def _draw(self, rows):
+        """
+        Deals one visible card on each of the given tables and returns their codes.
+        """
+        cursor = self.cursor[rows]
+        codes = self.shoe[rows, cursor].astype(np.int64)
+        self.cursor[rows] = cursor + 1
+        values = _CODE_VALUES[codes]
+        self._count(rows, values)
+        self.last_third_card[rows] = self.last_second_card[rows]
+        self.last_second_card[rows] = self.last_card[rows]
+        self.last_card[rows] = values
+        return codes
+
+    def _count(self, rows, values):
+        """
+        Removes one seen card per table from the remaining counts of the given tables.
+        """
+        self.remaining_counts[rows, values - 2] -= 1
+        self.remaining_total[rows] -= 1
+        self.running_count[rows] += _HI_LO[values - 2]
+
+    def _count_hole(self, rows):
+        """
+        Counts the revealed hole cards of the given tables, as ``Deck.add_last_secret_to_prob`` does.
+        """
+        rows = rows[self.hole_pending[rows]]
+        self._count(rows, _CODE_VALUES[self.dealer_hole[rows]])
+        self.hole_pending[rows] = False
+
+    def _add_card(self, rows, hands, codes):
+        """
+        Adds the given cards to the given hands.
+        """
+        is_ace = _CODE_IS_ACE[codes]
+        self.hard_total[rows, hands] += np.where(is_ace == 1, 1, _CODE_VALUES[codes])
+        self.ace_count[rows, hands] += is_ace
+        self.card_count[rows, hands] += 1
+        count = self.card_count[rows, hands]
+        ranks = codes // NUM_SUITS
+        self.pair[rows, hands] = (count == 2) & (self.first_rank[rows, hands] == ranks)
+        first = count == 1
+        self.first_rank[rows[first], hands[first]] = ranks[first]
+
+    def _check_bust(self, rows, hands):
+        busted = self.hand_value(self.hard_total[rows, hands], self.ace_count[rows, hands]) > 21
+        self.busted[rows[busted], hands[busted]] = True
+        self.done[rows[busted], hands[busted]] = True
+
+    def _start_round(self, rows):
+        """
+        Clears the given tables and deals two cards to the seat and the dealer.
+        """
+        for column in (self.hard_total, self.ace_count, self.card_count, self.first_rank):
+            column[rows] = 0
+        for column in (self.pair, self.done, self.busted, self.doubled):
+            column[rows] = False
+        self.hand_count[rows] = 1
+        self.active_hand[rows] = 0
+        self.splitted[rows] = False
+        self.bet[rows] = self.chip_amount / 100
+
+        # A hole card that was never revealed (the round ended with an illegal move) is counted now.
+        self._count_hole(rows)
+
+        # Deal the seat, the dealer's upcard, the seat and the hole card in one gather.
+        cursor = self.cursor[rows]
+        codes = self.shoe[rows[:, None], cursor[:, None] + np.arange(4)].astype(np.int64)
+        self.cursor[rows] = cursor + 4
+        values = _CODE_VALUES[codes]
+        is_ace = _CODE_IS_ACE[codes]
+        hard = np.where(is_ace == 1, 1, values)
+        for column in range(3):
+            self._count(rows, values[:, column])
+
+        self.hard_total[rows, 0] = hard[:, 0] + hard[:, 2]
+        self.ace_count[rows, 0] = is_ace[:, 0] + is_ace[:, 2]
+        self.card_count[rows, 0] = 2
+        self.first_rank[rows, 0] = codes[:, 0] // NUM_SUITS
+        self.pair[rows, 0] = codes[:, 0] // NUM_SUITS == codes[:, 2] // NUM_SUITS
+
+        self.dealer_up[rows] = values[:, 1]
+        self.dealer_hard[rows] = hard[:, 1]
+        self.dealer_aces[rows] = is_ace[:, 1]
+        self.dealer_hole[rows] = codes[:, 3]
+        self.hole_pending[rows] = True
+
+        # As in Deck.hit, the hole card is replaced by a random card that is still in the shoe.
+        position = self.rng.integers(cursor + 4, self.shoe_size)
+        self.last_third_card[rows] = values[:, 1]
+        self.last_second_card[rows] = values[:, 2]
+        self.last_card[rows] = _CODE_VALUES[self.shoe[rows, position]]
+
+    def _dealer_play(self, rows):
+        """
+        Reveals the hole card and draws to 17 on the given tables, if any of their hands is not busted.
+        """
+        hole = self.dealer_hole[rows]
+        self.dealer_hard[rows] += np.where(_CODE_IS_ACE[hole] == 1, 1, _CODE_VALUES[hole])
+        self.dealer_aces[rows] += _CODE_IS_ACE[hole]
+
+        live = ~self.busted[rows, 0] | ((self.hand_count[rows] == 2) & ~self.busted[rows, 1])
+        drawing = rows[live]
+        while drawing.size:
+            drawing = drawing[self.hand_value(self.dealer_hard[drawing], self.dealer_aces[drawing]) < 17]
+            if not drawing.size:
+                break
+            codes = self._draw(drawing)
+            self.dealer_hard[drawing] += np.where(_CODE_IS_ACE[codes] == 1, 1, _CODE_VALUES[codes])
+            self.dealer_aces[drawing] += _CODE_IS_ACE[codes]
+
+    def _results(self, rows):
+        """
+        Settles every hand of the given tables and updates the counters.
+        """
+        dealer_value = self.hand_value(self.dealer_hard[rows], self.dealer_aces[rows])
+        reward = np.zeros(rows.size, dtype=np.float64)
+        bet = self.bet[rows]
+        for hand in (0, 1):
+            playing = hand < self.hand_count[rows]
+            value = self.hand_value(self.hard_total[rows, hand], self.ace_count[rows, hand])
+            won = playing & (value <= 21) & ((dealer_value > 21) | (value > dealer_value))
+            drawn = playing & (value <= 21) & (dealer_value <= 21) & (value == dealer_value)
+            lost = playing & ~won & ~drawn
+            reward += np.where(won, bet, 0.0) - np.where(lost, bet, 0.0)
+            self.win[rows] += won
+            self.loss[rows] += lost
+            self.draw[rows] += drawn
+        self.played_hands[rows] += self.hand_count[rows]
+        self._rewards[rows] = reward
+        self.money[rows] += reward
+        self.all_money[rows] += self.hand_count[rows] * bet
+
+    def _write_obs(self):
+        """
+        Writes the observation of every table's active hand into the observation buffers.
+        """
+        rows = self._rows
+        active = self.active_hand
+        write = self._write_field
+        write("player_sum", self.hand_value(self.hard_total[rows, active], self.ace_count[rows, active]))
+        write("dealer_card", self.dealer_up)
+        write("usable_ace", (self.ace_count[rows, active] > 0) & (self.hard_total[rows, active] + 10 <= 21))
+        write("can_split", self.pair[rows, active] & ~self.splitted)
+        write("can_double", self.card_count[rows, active] == 2)
+        if self.envV != 1:
+            prob = self.probability_of_cards()
+            if self.envV == 2:
+                for index, key in enumerate(PROB_KEYS):
+                    write(key, prob[:, index] * 100)
+                write("last_card", self.last_card)
+            elif self.envV == 3:
+                write("prob", prob)
+                write("last_card", self.last_card)
+                write("last_second_card", self.last_second_card)
+                write("last_third_card", self.last_third_card)
+        return self._obs if self.flat_obs is None else self.flat_obs.buffer
+
+    def _write_field(self, key, values):
+        """
+        Writes one observation field of every table.
+        """
+        if self.flat_obs is None:
+            # Dict buffers of Discrete fields are integers, so the envV 2 percentages are truncated to fit them.
+            self._obs[key][:] = values
+        else:
+            self.flat_obs.write(key, values)
+
+    def probability_of_cards(self, out=None):
+        """
+        Returns the probability of drawing each rank from every table's shoe, given the cards seen so far.
+
+        Args:
+        - out (np.ndarray): Optional float array of shape (num_envs, 10) the probabilities are written into.
+
+        Returns:
+        - np.ndarray: The probabilities, shape (num_envs, 10). Without ``out`` this is an internal buffer
+          overwritten by later calls.
+        """
+        if out is None:
+            out = self._probabilities
+        return np.divide(self.remaining_counts, self.remaining_total[:, None], out=out)
@@ -0,0 +1,72 @@
+import os
+import tempfile
+
+import numpy as np
+
+from src.environment import BlackJackEnv, PROB_KEYS
+from src.seeding import spawn_seeds
+from src.shoe_bank import ShoeBank, generate_shoe_bank
+from src.vector_environment import BlackJackVectorEnv
+
+"""
+Replays the same pre-shuffled shoes through BlackJackEnv and BlackJackVectorEnv(num_envs=1) and checks that
+both implementations of the rules return the same observations, rewards and terminations.
+
+    python -m src.vector_environment_test
+"""
+
+ROUNDS = 2000
+
+
+def assert_same(observation, vector_observation, message):
+    """
+    Checks a BlackJackEnv observation against the only row of a BlackJackVectorEnv observation batch.
+    """
+    for key, value in observation.items():
+        value = np.asarray(value, dtype=np.float64)
+        if key in PROB_KEYS:
+            # The Discrete envV=2 percentages are truncated by the integer buffers of the vector env.
+            value = np.floor(value)
+        assert np.allclose(value, vector_observation[key][0].astype(np.float64), atol=1e-3), (
+            message, key, observation, vector_observation)
+
+
+folder = tempfile.mkdtemp()
+path = generate_shoe_bank(os.path.join(folder, "shoes.npy"), 64, seed=0)
+
+for envV in (1, 2, 3):
+    deck_seed = spawn_seeds(envV, 2)[0]
+    env = BlackJackEnv(envV=envV, render_mode=None, shoe_source=ShoeBank(path))
+    # The constructor of BlackJackEnv already deals the first shoe of the bank, so the vector env starts at the second.
+    vector_env = BlackJackVectorEnv(num_envs=1, envV=envV, seed=deck_seed, shoe_source=ShoeBank(path, offset=1))
+    observation, _ = env.reset(seed=envV)
+    vector_observation, _ = vector_env.reset()
+    # Mostly basic play with some random (also illegal) actions, so that every rule is exercised.
+    rng = np.random.default_rng(envV)
+    rounds = steps = 0
+    while rounds < ROUNDS:
+        assert_same(observation, vector_observation, (envV, steps))
+        if rng.random() < 0.1:
+            action = int(rng.integers(0, 4))
+        elif observation["can_split"]:
+            action = 3
+        elif observation["can_double"] and observation["player_sum"] in (10, 11):
+            action = 2
+        else:
+            action = int(observation["player_sum"] < 17)
+        observation, reward, done, _, _ = env.step(action)
+        vector_observation, vector_reward, terminated, _, infos = vector_env.step(np.array([action]))
+        steps += 1
+        assert done == terminated[0], (envV, steps, action, done, terminated)
+        assert reward == vector_reward[0], (envV, steps, action, reward, vector_reward)
+        if done:
+            assert infos["_final_observation"][0]
+            assert_same(observation, infos["final_observation"], (envV, steps))
+            observation, _ = env.reset(full_reset=False)
+            rounds += 1
+
+    assert (env.win, env.loss, env.draw, env.illegal_moves) == (
+        vector_env.win[0], vector_env.loss[0], vector_env.draw[0], vector_env.illegal_moves[0])
+    assert env.money == vector_env.money[0] and env.all_money == vector_env.all_money[0]
+    print(f"envV={envV}: {rounds} rounds and {steps} steps match")
+    env.close()
@@ -1,3 +1,5 @@
+import numpy as np
+
 from src.hand import Hand
 
 
@@ -30,192 +32,258 @@ class Actions:
     SPLIT = 3
     SURRENDER = 4
 
-class WikipediaAgent:
-    def __init__(self,surrender=False,double_down=True):
-        """
-        Initializes a WikipediaAgent instance with optional surrender and double down abilities.
-
-        Args:
-        - surrender (bool): Whether the agent can surrender (default is False).
-        - double_down (bool): Whether the agent can double down (default is True).
-        """
-
-        # Allowes the agent to surrender
-        self.surrender = surrender
-
-        # Allowes the agent to double down
-        self.double_down = double_down
-
-    def get_action(self, dealer_hand:Hand, player_hand:Hand):
-        """
-        Returns the recommended action for the player given the current hands.
-
-        Args:
-        - dealer_hand (Hand): The dealer's hand.
-        - player_hand (Hand): The player's hand.
-
-        Returns:
-        - int: The recommended action (Actions.STAND, Actions.HIT, Actions.DOUBLE, Actions.SPLIT, Actions.SURRENDER).
-        """
-        player_value = player_hand.get_value()
+def rule_action(player_value, soft, pair_value, dealer_value, can_double, surrender=False, double_down=True):
+    """
+    Returns the action of the Wikipedia strategy for a hand described by plain values.
 
-        # Dealer's upcard
-        dealerCard = dealer_hand.cards[0]
+    Args:
+    - player_value (int): The value of the player's hand.
+    - soft (bool): Whether the hand is soft.
+    - pair_value (int): The value of the paired cards if the hand can be split, 0 otherwise.
+    - dealer_value (int): The value of the dealer's upcard.
+    - can_double (bool): Whether the hand has exactly two cards.
+    - surrender (bool): Whether the agent can surrender.
+    - double_down (bool): Whether the agent can double down.
 
-        # Pairs strategy
-        if player_hand.can_split():
-            card = player_hand.cards[0]
-            if card.rank == 'Ace':
-                return Actions.SPLIT
-            elif card.value == 10:
+    Returns:
+    - int: The recommended action, or None if the strategy has no rule for the hand.
+    """
+    # Pairs strategy
+    if pair_value:
+        if pair_value == 11:
+            return Actions.SPLIT
+        elif pair_value == 10:
+            return Actions.STAND
+        elif pair_value == 9:
+            if dealer_value in (7, 10, 11):
                 return Actions.STAND
-            elif card.value == 9:
-                if dealerCard.rank in ['Seven', 'Ten','Jack','Queen','King', 'Ace']:
-                    return Actions.STAND
-                return Actions.SPLIT
-            elif card.value == 8:
-                if dealerCard.rank in ['Ace'] and self.surrender:
-                    return Actions.SURRENDER
-                else:
-                    return Actions.SPLIT
-            elif card.value == 7:
-                if dealerCard.rank in ['Eight', 'Nine', 'Ten','Jack','Queen','King', 'Ace']:
-                    return Actions.HIT
-                return Actions.SPLIT
-            elif card.value == 6:
-                if dealerCard.rank in ['Seven', 'Eight', 'Nine', 'Ten','Jack','Queen','King', 'Ace']:
-                    return Actions.HIT
+            return Actions.SPLIT
+        elif pair_value == 8:
+            if dealer_value == 11 and surrender:
+                return Actions.SURRENDER
+            else:
                 return Actions.SPLIT
-            elif card.value == 5:
-                if dealerCard.rank in ['Ten','Jack','Queen','King', 'Ace']:
-                    return Actions.HIT
-                elif self.double_down:
-                    return Actions.DOUBLE
-                else:
-                    return Actions.HIT
-            elif card.value == 4:
-                if dealerCard.rank in ['Five', 'Six']:
-                    return Actions.SPLIT
+        elif pair_value == 7:
+            if dealer_value >= 8:
                 return Actions.HIT
-            elif card.value == 3 or card.value == 2:
-                if dealerCard.rank in ['Eight', 'Nine', 'Ten','Jack','Queen','King', 'Ace']:
-                    return Actions.HIT
+            return Actions.SPLIT
+        elif pair_value == 6:
+            if dealer_value >= 7:
+                return Actions.HIT
+            return Actions.SPLIT
+        elif pair_value == 5:
+            if dealer_value >= 10:
+                return Actions.HIT
+            elif double_down:
+                return Actions.DOUBLE
+            else:
+                return Actions.HIT
+        elif pair_value == 4:
+            if dealer_value in (5, 6):
                 return Actions.SPLIT
+            return Actions.HIT
+        elif pair_value == 3 or pair_value == 2:
+            if dealer_value >= 8:
+                return Actions.HIT
+            return Actions.SPLIT
 
 
-        # Soft hands strategy
-        elif player_hand.is_soft_hand():
-            if player_value == 21:
-                return Actions.STAND
-            elif player_value == 20:
-                return Actions.STAND
-            elif player_value == 19:
-                if dealerCard.rank in ['Six']:
-                    if player_hand.can_double() and self.double_down:
-                        return Actions.DOUBLE
-                return Actions.STAND
-            elif player_value == 18:
-                if dealerCard.rank in ['Two', 'Three', 'Four', 'Five', 'Six']:
-                    if player_hand.can_double() and self.double_down:
-                        return Actions.DOUBLE
-                    else:
-                        return Actions.STAND
-                if dealerCard.rank in ['Seven', 'Eight']:
-                    return Actions.STAND
-                return Actions.HIT
-            elif player_value == 17:
-                if dealerCard.rank in ['Three', 'Four', 'Five', 'Six']:
-                    if player_hand.can_double() and self.double_down:
-                        return Actions.DOUBLE
-                    else:
-                        return Actions.HIT
-                else:
-                    return Actions.HIT
-            elif player_value == 16 or player_value == 15:
-                if dealerCard.rank in ['Four', 'Five', 'Six']:
-                    if player_hand.can_double() and self.double_down:
-                        return Actions.DOUBLE
-                    else:
-                        return Actions.HIT
+    # Soft hands strategy
+    elif soft:
+        if player_value == 21:
+            return Actions.STAND
+        elif player_value == 20:
+            return Actions.STAND
+        elif player_value == 19:
+            if dealer_value == 6:
+                if can_double and double_down:
+                    return Actions.DOUBLE
+            return Actions.STAND
+        elif player_value == 18:
+            if dealer_value <= 6:
+                if can_double and double_down:
+                    return Actions.DOUBLE
                 else:
-                    return Actions.HIT
-            elif player_value == 14 or player_value == 13:
-                if dealerCard.rank in ['Five', 'Six']:
-                    if player_hand.can_double() and self.double_down:
-                        return Actions.DOUBLE
-                    else:
-                        return Actions.HIT
+                    return Actions.STAND
+            if dealer_value in (7, 8):
+                return Actions.STAND
+            return Actions.HIT
+        elif player_value == 17:
+            if 3 <= dealer_value <= 6:
+                if can_double and double_down:
+                    return Actions.DOUBLE
                 else:
                     return Actions.HIT
-            elif player_value == 12 and len(player_hand.cards)==2:
-                if dealerCard.rank in ['Six']:
-                    if player_hand.can_double() and self.double_down:
-                        return Actions.DOUBLE
-                    else:
-                        return Actions.HIT
+            else:
+                return Actions.HIT
+        elif player_value == 16 or player_value == 15:
+            if 4 <= dealer_value <= 6:
+                if can_double and double_down:
+                    return Actions.DOUBLE
                 else:
                     return Actions.HIT
-
-
-
-        # Hard hands strategy
-        elif player_value >= 17:
-            if dealerCard.rank == 'Ace' and player_value == 17:
-                if self.surrender:
-                    return Actions.SURRENDER
-            return Actions.STAND
-        elif player_value == 16:
-            if dealerCard.rank in ['Nine', 'Ten','Jack','Queen','King', 'Ace']:
-                if self.surrender:
-                    return Actions.SURRENDER
+            else:
+                return Actions.HIT
+        elif player_value == 14 or player_value == 13:
+            if dealer_value in (5, 6):
+                if can_double and double_down:
+                    return Actions.DOUBLE
                 else:
                     return Actions.HIT
-            elif dealerCard.rank in ['Seven', 'Eight']:
-                return Actions.HIT
             else:
-                return Actions.STAND
-        elif player_value == 15:
-            if dealerCard.rank in ['Ten','Jack','Queen','King', 'Ace']:
-                if self.surrender:
-                    return Actions.SURRENDER
+                return Actions.HIT
+        elif player_value == 12 and can_double:
+            if dealer_value == 6:
+                if can_double and double_down:
+                    return Actions.DOUBLE
                 else:
                     return Actions.HIT
-            elif dealerCard.rank in ['Seven', 'Eight', 'Nine']:
-                return Actions.HIT
             else:
-                return Actions.STAND
-        elif player_value == 14 or player_value == 13:
-            if dealerCard.rank in ['Seven', 'Eight', 'Nine', 'Ten','Jack','Queen','King', 'Ace']:
                 return Actions.HIT
-            else:
-                return Actions.STAND
-        elif player_value == 12:
-            if dealerCard.rank in ['Four', 'Five', 'Six']:
-                return Actions.STAND
+
+
+
+    # Hard hands strategy
+    elif player_value >= 17:
+        if dealer_value == 11 and player_value == 17:
+            if surrender:
+                return Actions.SURRENDER
+        return Actions.STAND
+    elif player_value == 16:
+        if dealer_value >= 9:
+            if surrender:
+                return Actions.SURRENDER
             else:
                 return Actions.HIT
-        elif player_value == 11:
-            if player_hand.can_double() and self.double_down:
-                return Actions.DOUBLE
+        elif dealer_value in (7, 8):
+            return Actions.HIT
+        else:
+            return Actions.STAND
+    elif player_value == 15:
+        if dealer_value >= 10:
+            if surrender:
+                return Actions.SURRENDER
             else:
                 return Actions.HIT
-        elif player_value == 10:
-            if dealerCard.rank in ['Ten','Jack','Queen','King', 'Ace']:
-                return Actions.HIT
-            elif player_hand.can_double() and self.double_down:
+        elif 7 <= dealer_value <= 9:
+            return Actions.HIT
+        else:
+            return Actions.STAND
+    elif player_value == 14 or player_value == 13:
+        if dealer_value >= 7:
+            return Actions.HIT
+        else:
+            return Actions.STAND
+    elif player_value == 12:
+        if 4 <= dealer_value <= 6:
+            return Actions.STAND
+        else:
+            return Actions.HIT
+    elif player_value == 11:
+        if can_double and double_down:
+            return Actions.DOUBLE
+        else:
+            return Actions.HIT
+    elif player_value == 10:
+        if dealer_value >= 10:
+            return Actions.HIT
+        elif can_double and double_down:
+            return Actions.DOUBLE
+        else:
+            return Actions.HIT
+    elif player_value == 9:
+        if 3 <= dealer_value <= 6:
+            if can_double and double_down:
                 return Actions.DOUBLE
             else:
                 return Actions.HIT
-        elif player_value == 9:
-            if dealerCard.rank in ['Three', 'Four', 'Five', 'Six']:
-                if player_hand.can_double() and self.double_down:
-                    return Actions.DOUBLE
-                else:
-                    return Actions.HIT
-            else:
-                return Actions.HIT
-        elif player_value <= 8:
+        else:
             return Actions.HIT
+    elif player_value <= 8:
+        return Actions.HIT
+
+
+NO_ACTION = -1
+
+_TABLE = None
+
+
+def strategy_table():
+    """
+    Returns the strategy compiled into a lookup table (built on the first call).
+
+    The table is indexed by [surrender, double_down, player_value, soft, pair_value, dealer_value, can_double],
+    where pair_value is 0 for hands that cannot be split. Hands without a rule hold ``NO_ACTION``.
+
+    Returns:
+    - np.ndarray: The int8 table of shape (2, 2, 32, 2, 12, 12, 2).
+    """
+    global _TABLE
+    if _TABLE is None:
+        table = np.full((2, 2, 32, 2, 12, 12, 2), NO_ACTION, dtype=np.int8)
+        for index in np.ndindex(table.shape):
+            surrender, double_down, player_value, soft, pair_value, dealer_value, can_double = index
+            action = rule_action(player_value, bool(soft), pair_value, dealer_value, bool(can_double),
+                                 bool(surrender), bool(double_down))
+            if action is not None:
+                table[index] = action
+        table.flags.writeable = False
+        _TABLE = table
+    return _TABLE
+
+
+class WikipediaAgent:
+    def __init__(self,surrender=False,double_down=True):
+        """
+        Initializes a WikipediaAgent instance with optional surrender and double down abilities.
+
+        Args:
+        - surrender (bool): Whether the agent can surrender (default is False).
+        - double_down (bool): Whether the agent can double down (default is True).
+        """
+
+        # Allowes the agent to surrender
+        self.surrender = surrender
+
+        # Allowes the agent to double down
+        self.double_down = double_down
+
+        # Compiled strategy, indexed by [player_value, soft, pair_value, dealer_value, can_double]
+        self.table = strategy_table()[int(surrender), int(double_down)]
+        # Nested lists are faster than NumPy indexing for one hand at a time
+        self._lookup = self.table.tolist()
 
+    def get_action(self, dealer_hand:Hand, player_hand:Hand):
+        """
+        Returns the recommended action for the player given the current hands.
 
+        Args:
+        - dealer_hand (Hand): The dealer's hand.
+        - player_hand (Hand): The player's hand.
 
+        Returns:
+        - int: The recommended action (Actions.STAND, Actions.HIT, Actions.DOUBLE, Actions.SPLIT, Actions.SURRENDER).
+        """
+        pair_value = player_hand.cards[0].value if player_hand.can_split() else 0
+        dealer_value = dealer_hand.cards[0].value
+        action = self._lookup[player_hand.value][player_hand.soft][pair_value][dealer_value][len(player_hand.cards) == 2]
+        return None if action == NO_ACTION else action
+
+    def get_actions(self, batch_obs):
+        """
+        Returns the recommended actions for a batch of observations.
+
+        Args:
+        - batch_obs (dict): Dict observations of any environment version with array fields, e.g. from
+          ``BlackJackVectorEnv``.
+
+        Returns:
+        - np.ndarray: The recommended actions, ``NO_ACTION`` for hands without a rule.
+        """
+        player_sum = np.asarray(batch_obs["player_sum"], dtype=np.intp)
+        soft = np.asarray(batch_obs["usable_ace"], dtype=np.intp)
+        can_split = np.asarray(batch_obs["can_split"], dtype=bool)
+        # A splittable soft hand is a pair of aces, any other pair is worth half of the total.
+        pair_value = np.where(can_split, np.where(soft == 1, 11, player_sum // 2), 0)
+        return self.table[player_sum, soft, pair_value, np.asarray(batch_obs["dealer_card"], dtype=np.intp),
+                          np.asarray(batch_obs["can_double"], dtype=np.intp)]
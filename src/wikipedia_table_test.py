@@ -0,0 +1,43 @@
+import itertools
+
+import numpy as np
+
+from src.environment import BlackJackEnv
+from src.wikipedia_agent import WikipediaAgent, rule_action, strategy_table, NO_ACTION
+
+"""
+Checks the compiled Wikipedia strategy table against ``rule_action``, and the single-hand and batched lookups
+of ``WikipediaAgent`` against the rules applied to the hands of a ``BlackJackEnv``.
+
+    python -m src.wikipedia_table_test
+"""
+
+table = strategy_table()
+for index in np.ndindex(table.shape):
+    surrender, double_down, player_value, soft, pair_value, dealer_value, can_double = index
+    action = rule_action(player_value, bool(soft), pair_value, dealer_value, bool(can_double), bool(surrender),
+                         bool(double_down))
+    assert table[index] == (NO_ACTION if action is None else action), (index, table[index], action)
+print(f"The strategy table matches rule_action on all {table.size} entries")
+
+env = BlackJackEnv(envV=1, render_mode=None)
+env.reset(seed=0)
+decisions = 0
+for surrender, double_down in itertools.product((False, True), repeat=2):
+    agent = WikipediaAgent(surrender, double_down)
+    for _ in range(5000):
+        observation, _ = env.reset(full_reset=False)
+        done = False
+        while not done:
+            hand = env.playingHand
+            pair_value = hand.cards[0].value if hand.can_split() else 0
+            action = rule_action(hand.value, hand.soft, pair_value, env.dealer_hand.cards[0].value,
+                                 len(hand.cards) == 2, surrender, double_down)
+            assert agent.get_action(env.dealer_hand, hand) == action, (hand, env.dealer_hand, action)
+            batch = {key: np.array([value]) for key, value in observation.items()}
+            assert agent.get_actions(batch)[0] == (NO_ACTION if action is None else action), (observation, action)
+            decisions += 1
+            # Surrender is not an action of the environment, and hands without a rule stand.
+            observation, _, done, _, _ = env.step(0 if action in (None, 4) else action)
+print(f"get_action and get_actions match rule_action on {decisions} decisions")
+env.close()